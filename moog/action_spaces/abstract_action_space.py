@@ -1,6 +1,7 @@
 """Abstract action space."""
 
 import abc
+import numpy as np
 
 
 class AbstractActionSpace(abc.ABC):
@@ -47,3 +48,54 @@ class AbstractActionSpace(abc.ABC):
             dm_env.specs.ArraySpec or nested structure of such.
         """
         pass
+
+
+def apply_action_to_sprites(state, action_layers, action, momentum,
+                            scaling_factor, delta, control_velocity):
+    """Momentum-integrate, clip, and apply an action to sprite velocities.
+
+    This fuses the per-step update shared by the Grid and Joystick action
+    spaces. The two-dimensional action is integrated with scalar arithmetic,
+    which for so few components is much cheaper than numpy ufunc dispatch, and
+    the per-sprite velocity update is vectorized.
+
+    Args:
+        state: Environment state. OrderedDict of iterables of sprites.
+        action_layers: Iterable of keys in state. All sprites in these layers
+            are acted upon.
+        action: Tuple of two floats. Previous action.
+        momentum: Float. Discount factor for the previous action.
+        scaling_factor: Float. Action is clipped to [-scaling_factor,
+            scaling_factor].
+        delta: Iterable of two floats. Increment added to the action.
+        control_velocity: Bool. Whether to set velocity (True) or add to it
+            as a force (False).
+
+    Returns:
+        New action, a tuple of two floats.
+    """
+    action_x, action_y = action
+    delta_x, delta_y = delta
+    action_x = min(scaling_factor,
+                   max(-scaling_factor, momentum * action_x + delta_x))
+    action_y = min(scaling_factor,
+                   max(-scaling_factor, momentum * action_y + delta_y))
+    action = (action_x, action_y)
+
+    sprites = [s for k in action_layers for s in state[k]]
+    if not sprites:
+        return action
+    inv_masses = np.array([s.inv_mass for s in sprites])
+    # Outer product straight into a fresh result array, with no intermediate
+    # array for the action. The result cannot be a reused buffer, because its
+    # rows become the sprites' velocities when control_velocity is True.
+    delta_vels = np.multiply.outer(inv_masses, action)
+
+    if control_velocity:
+        for sprite, delta_vel in zip(sprites, delta_vels):
+            sprite.velocity = delta_vel
+    else:
+        for sprite, delta_vel in zip(sprites, delta_vels):
+            sprite.velocity += delta_vel
+
+    return action
@@ -35,6 +35,10 @@ class Composite(abstract_action_space.AbstractActionSpace):
         """
         self.action_spaces = action_spaces
         self._action_keys = action_spaces.keys()
+        # Ordered (key, action space) pairs, cached to avoid dict lookups in the
+        # per-step hot path.
+        self._ordered_items = tuple(action_spaces.items())
+        self._ordered_keys = tuple(action_spaces.keys())
 
         self._action_spec = {
             key: value.action_spec() for key,value in self.action_spaces.items()
@@ -47,18 +51,31 @@ class Composite(abstract_action_space.AbstractActionSpace):
             state: Ordereddict of layers of sprites. Environment state.
             action: Dict. Keys much be the same as self._action_keys. Each value
                 will be fed into the action space of the corresponding key.
+                Alternatively, a tuple or list of actions ordered like
+                self.action_keys, which skips the dict indexing.
         """
-        for k, v in action.items():
-            self.action_spaces[k].step(state, v)
+        if isinstance(action, (tuple, list)):
+            if len(action) != len(self._ordered_items):
+                raise ValueError(
+                    'action has length {} but must have one element for each '
+                    'of the action keys {}'.format(
+                        len(action), self._ordered_keys))
+            for (_, action_space), v in zip(self._ordered_items, action):
+                action_space.step(state, v)
+        else:
+            for k, v in action.items():
+                self.action_spaces[k].step(state, v)
 
     def reset(self, state):
-        for k in self.action_spaces:
-            self.action_spaces[k].reset(state)
+        for _, action_space in self._ordered_items:
+            action_space.reset(state)
 
     def random_action(self):
         """Return randomly sampled action."""
         random_action = {
-            k: self.action_spaces[k].random_action() for k in self._action_keys}
+            k: action_space.random_action()
+            for k, action_space in self._ordered_items
+        }
         return random_action
 
     def action_spec(self):
@@ -66,4 +83,4 @@ class Composite(abstract_action_space.AbstractActionSpace):
 
     @property
     def action_keys(self):
-        return list(self._action_keys)
+        return list(self._ordered_keys)
@@ -12,13 +12,19 @@ class Grid(abstract_action_space.AbstractActionSpace):
     actions control either the force or the velocity of the agent(s).
     """
 
-    _ACTIONS = (
-        np.array([-1, 0]),  # Move left
-        np.array([1, 0]),  # Move right
-        np.array([0, -1]),  # Move down
-        np.array([0, 1]),  # Move up
-        np.array([0, 0]),  # Do not move
-    )
+    # Single contiguous float array, so that indexing by an action gives a row
+    # view rather than a lookup into a tuple of separate arrays.
+    _ACTIONS = np.array([
+        [-1., 0.],  # Move left
+        [1., 0.],  # Move right
+        [0., -1.],  # Move down
+        [0., 1.],  # Move up
+        [0., 0.],  # Do not move
+    ])
+
+    # Action spec shared by all Grid instances. Specs are immutable, so there is
+    # no need to construct one per instance.
+    _ACTION_SPEC = specs.DiscreteArray(len(_ACTIONS))
 
     def __init__(self, scaling_factor=1., action_layers='agent',
                  control_velocity=False, momentum=0.):
@@ -47,7 +53,7 @@ class Grid(abstract_action_space.AbstractActionSpace):
         self._control_velocity = control_velocity
         self._momentum = momentum
 
-        self._action_spec = specs.DiscreteArray(len(self._ACTIONS))
+        self._action_spec = Grid._ACTION_SPEC
 
     def step(self, state, action):
         """Apply action to environment state.
@@ -56,23 +62,15 @@ class Grid(abstract_action_space.AbstractActionSpace):
             state: Ordereddict of layers of sprites. Environment state.
             action: Numpy float array of size (2). Force to apply.
         """
-        self._action *= self._momentum
-
-        self._action += Grid._ACTIONS[action]
-        self._action = np.clip(
-            self._action, -self._scaling_factor, self._scaling_factor)
-            
-        for action_layer in self._action_layers:
-            for sprite in state[action_layer]:
-                if self._control_velocity:
-                    sprite.velocity = self._action / sprite.mass
-                else:
-                    sprite.velocity += self._action / sprite.mass
+        self._action = abstract_action_space.apply_action_to_sprites(
+            state, self._action_layers, self._action, self._momentum,
+            self._scaling_factor, Grid._ACTIONS[action].tolist(),
+            self._control_velocity)
 
     def reset(self, state):
         """Reset action space at start of new episode."""
         del state
-        self._action = np.zeros(2)
+        self._action = (0., 0.)
 
     def random_action(self):
         """Return randomly sampled action."""
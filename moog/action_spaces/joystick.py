@@ -4,6 +4,11 @@ from . import abstract_action_space
 from dm_env import specs
 import numpy as np
 
+# Action spec shared by all Joystick instances. Specs are immutable, so there is
+# no need to construct one per instance.
+_JOYSTICK_SPEC = specs.BoundedArray(
+    shape=(2,), dtype=np.float32, minimum=-1, maximum=1)
+
 
 class Joystick(abstract_action_space.AbstractActionSpace):
     """Joystick action space."""
@@ -39,8 +44,7 @@ class Joystick(abstract_action_space.AbstractActionSpace):
         self._control_velocity = control_velocity
         self._momentum = momentum
 
-        self._action_spec = specs.BoundedArray(
-            shape=(2,), dtype=np.float32, minimum=-1, maximum=1)
+        self._action_spec = _JOYSTICK_SPEC
 
     def step(self, state, action):
         """Apply action to environment state.
@@ -52,22 +56,15 @@ class Joystick(abstract_action_space.AbstractActionSpace):
         if self._constrained_lr:
             action[1] = 0.
 
-        self._action *= self._momentum
-        self._action += self._scaling_factor * action
-        self._action = np.clip(
-            self._action, -self._scaling_factor, self._scaling_factor)
-        
-        for action_layer in self._action_layers:
-            for sprite in state[action_layer]:
-                if self._control_velocity:
-                    sprite.velocity = self._action / sprite.mass
-                else:
-                    sprite.velocity += self._action / sprite.mass
+        self._action = abstract_action_space.apply_action_to_sprites(
+            state, self._action_layers, self._action, self._momentum,
+            self._scaling_factor, (self._scaling_factor * action).tolist(),
+            self._control_velocity)
 
     def reset(self, state):
         """Reset action space at start of new episode."""
         del state
-        self._action = np.zeros(2)
+        self._action = (0., 0.)
         
     def random_action(self):
         """Return randomly sampled action."""
@@ -8,6 +8,11 @@ from . import abstract_action_space
 from dm_env import specs
 import numpy as np
 
+# Action spec shared by all SetPosition instances. Specs are immutable, so there
+# is no need to construct one per instance.
+_SET_POSITION_SPEC = specs.BoundedArray(
+    shape=(2,), dtype=np.float32, minimum=0, maximum=1)
+
 
 class SetPosition(abstract_action_space.AbstractActionSpace):
     """SetPosition action space."""
@@ -28,8 +33,7 @@ class SetPosition(abstract_action_space.AbstractActionSpace):
         self._action_layers = action_layers
         self._inertia = inertia
 
-        self._action_spec = specs.BoundedArray(
-            shape=(2,), dtype=np.float32, minimum=0, maximum=1)
+        self._action_spec = _SET_POSITION_SPEC
 
     def step(self, state, action):
         """Apply action to environment state.
@@ -39,12 +43,17 @@ class SetPosition(abstract_action_space.AbstractActionSpace):
             action: Numpy float array of size (2), in [0, 1]. Position to set
                 for the agent(s) in self._action_layers.
         """
-        for action_layer in self._action_layers:
-            for sprite in state[action_layer]:
-                sprite.position = (
-                    self._inertia * sprite.position +
-                    (1 - self._inertia) * action
-                )
+        sprites = [s for k in self._action_layers for s in state[k]]
+        if not sprites:
+            return
+        # The sprite position setter forbids in-place modification, so update
+        # the freshly gathered positions array in place instead.
+        k_action = (1 - self._inertia) * np.asarray(action)
+        positions = np.array([s.position for s in sprites])
+        positions *= self._inertia
+        positions += k_action
+        for sprite, new_position in zip(sprites, positions):
+            sprite.position = new_position
 
     def random_action(self):
         """Return randomly sampled action."""
@@ -3,4 +3,5 @@
 from .abstract_wrapper import AbstractEnvironmentWrapper
 from .logger import LoggingEnvironment
 from .multi_agent import MultiAgentEnvironment
+from .simulation import ForkSimulationEnvironment
 from .simulation import SimulationEnvironment
@@ -16,6 +16,20 @@ class AbstractEnvironmentWrapper(abc.ABC):
     def __init__(self, environment):
         self._environment = environment
 
+    def __getattr__(self, name):
+        """Forward attributes not defined by the wrapper to the environment.
+
+        This is only called when normal attribute lookup fails, so the explicit
+        forwarders below remain the fast path. Results are not cached on the
+        wrapper, because attributes like state and physics can be rebound on the
+        underlying environment (e.g. by SimulationEnvironment.sim_pop()).
+        """
+        if name == '_environment':
+            # Avoid infinite recursion if _environment is not yet set, e.g.
+            # during unpickling
+            raise AttributeError(name)
+        return getattr(self._environment, name)
+
     def reset(self):
         return self._environment.reset()
     
@@ -18,6 +18,7 @@ from datetime import datetime
 import json
 import logging
 import numpy as np
+import operator
 import os
 import time
 
@@ -29,6 +30,11 @@ from moog import sprite
 # episodes in your dataset is less than 10^_FILENAME_ZFILL.
 _FILENAME_ZFILL = 5
 
+# Suffix of the file an episode is written to until the episode is complete.
+# The suffix keeps the filename non-numerical, so unfinished episodes are not
+# read as episode logs.
+_PARTIAL_SUFFIX = '.partial'
+
 
 class VertexLogging():
     NEVER = 'NEVER'
@@ -36,6 +42,29 @@ class VertexLogging():
     WHEN_NECESSARY = 'WHEN_NECESSARY'
 
 
+def _serialize_list(x):
+    return [_serialize(a) for a in x]
+
+
+def _serialize_dict(x):
+    return {k: _serialize(v) for k, v in x.items()}
+
+
+# Handlers keyed by exact type, so that serializing the common types costs a
+# single dict lookup instead of a chain of isinstance checks. Numpy arrays are
+# converted by tolist() directly, which already yields nested native lists.
+_SERIALIZE_DISPATCH = {
+    np.ndarray: lambda x: x.tolist(),
+    np.float32: float,
+    np.float64: float,
+    np.int32: int,
+    np.int64: int,
+    list: _serialize_list,
+    tuple: _serialize_list,
+    dict: _serialize_dict,
+}
+
+
 def _serialize(x):
     """Serialize a value x.
 
@@ -44,7 +73,8 @@ def _serialize(x):
 
     Specifically, numpy arrays are not JSON serializable, so we must convert
     numpy arrays to lists. This function is recursive to handle nestings inside
-    of lists/tuples/dictionaries.
+    of lists/tuples/dictionaries. Since json has no tuple type, tuples are
+    serialized as lists.
 
     Args:
         x: Value to serialize.
@@ -52,18 +82,21 @@ def _serialize(x):
     Returns:
         Serialized value that can be JSON dumped.
     """
+    handler = _SERIALIZE_DISPATCH.get(type(x))
+    if handler is not None:
+        return handler(x)
+
+    # Fall back to isinstance checks for subclasses (e.g. OrderedDict)
     if isinstance(x, np.ndarray):
         return x.tolist()
     elif isinstance(x, (np.float32, np.float64)):
         return float(x)
     elif isinstance(x, (np.int32, np.int64)):
         return int(x)
-    elif isinstance(x, list):
-        return [_serialize(a) for a in x]
-    elif isinstance(x, tuple):
-        return tuple([_serialize(a) for a in x])
+    elif isinstance(x, (list, tuple)):
+        return _serialize_list(x)
     elif isinstance(x, dict):
-        return {k: _serialize(v) for k, v in x.items()}
+        return _serialize_dict(x)
     else:
         return x
 
@@ -77,7 +110,8 @@ class LoggingEnvironment(env_wrappers.AbstractEnvironmentWrapper):
     """
 
     def __init__(self, environment, log_dir='logs',
-                 log_vertices='WHEN_NECESSARY'):
+                 log_vertices='WHEN_NECESSARY',
+                 compress_unchanged_sprites=False):
         """Constructor.
 
         Args:
@@ -92,8 +126,13 @@ class LoggingEnvironment(env_wrappers.AbstractEnvironmentWrapper):
                     vertices that were logged for that sprite (identifiable by
                     its id) the last time its vertices were logged.
                 * 'ALWAYS'. Log vertices for all sprites every timestep.
+            compress_unchanged_sprites: Bool. If True, a sprite whose serialized
+                attributes are identical to those of the previous timestep is
+                logged as [id] instead of its full attribute list. This greatly
+                reduces log size for tasks with many static sprites.
         """
         super(LoggingEnvironment, self).__init__(environment)
+        self._compress_unchanged_sprites = compress_unchanged_sprites
 
         # Make sure log_vertices is a valid value
         if not hasattr(VertexLogging, log_vertices):
@@ -112,6 +151,8 @@ class LoggingEnvironment(env_wrappers.AbstractEnvironmentWrapper):
 
         # These are the attributes that we'll log
         self._attributes = list(sprite.Sprite.FACTOR_NAMES) + ['id']
+        # Fetches all logged attributes of a sprite in a single call
+        self._get_attributes = operator.attrgetter(*self._attributes)
 
         # Log attribute list
         attributes_filename = os.path.join(self._log_dir, 'attributes.txt')
@@ -123,9 +164,21 @@ class LoggingEnvironment(env_wrappers.AbstractEnvironmentWrapper):
         # Log description
         self._log_description()
 
-        # Initialize self._episode_log
+        # Initialize episode log file. Steps are streamed to this file as they
+        # occur, so the episode need not be held in memory.
         self._episode_count = 0
-        self._episode_log = []
+        self._episode_file = None
+        self._episode_filename = None
+
+        # Serialized attributes of each sprite at the previous timestep, keyed
+        # by sprite id. Only used if compress_unchanged_sprites.
+        self._last_serialized_sprites = {}
+        self._serialized_sprites = {}
+
+        # Timestamps are computed from a monotonic nanosecond counter offset to
+        # the wall-clock time at construction.
+        self._t0 = time.time()
+        self._t0_ns = time.perf_counter_ns()
 
     def _log_description(self):
         """Log a description of the data to a description.txt file."""
@@ -176,17 +229,36 @@ class LoggingEnvironment(env_wrappers.AbstractEnvironmentWrapper):
                 'serialized sprite appears, or when the sprite has changed '
                 'shape.'
             )
+        if self._compress_unchanged_sprites:
+            description += (
+                '\n\n'
+                '\n\n'
+                'Furthermore, a sprite whose attributes are unchanged since '
+                'the previous timestep of the episode is serialized as a list '
+                '[id] containing only its id. Its attributes are those of the '
+                'most recent full serialization of the sprite with that id.'
+            )
         with open(description_filename, 'w') as f:
             f.write(description)
 
     def _serialize_sprite(self, s):
         """Serialize a sprite as a list of attributes."""
-        attributes = [_serialize(getattr(s, x)) for x in self._attributes]
-        if (self._log_vertices == VertexLogging.ALWAYS or
+        attributes = [_serialize(x) for x in self._get_attributes(s)]
+        log_vertices = (
+            self._log_vertices == VertexLogging.ALWAYS or
             (self._log_vertices == VertexLogging.WHEN_NECESSARY and
-                s.just_set_shape)):
-            attributes.append(s.vertices.tolist())
+                s.just_set_shape)
+        )
         s.just_set_shape = False
+
+        if self._compress_unchanged_sprites:
+            self._serialized_sprites[s.id] = attributes
+            if (not log_vertices and
+                    self._last_serialized_sprites.get(s.id) == attributes):
+                return [s.id]
+
+        if log_vertices:
+            attributes = attributes + [s.vertices.tolist()]
         return attributes
 
     def _serialized_state(self):
@@ -195,30 +267,77 @@ class LoggingEnvironment(env_wrappers.AbstractEnvironmentWrapper):
             [k, [self._serialize_sprite(s) for s in self.state[k]]]
             for k in self.state
         ]
+        if self._compress_unchanged_sprites:
+            # Only keep sprites that are still present, so the cache does not
+            # grow over the episode
+            self._last_serialized_sprites = self._serialized_sprites
+            self._serialized_sprites = {}
         return serialized_state
 
     def step(self, action):
         """Step the environment with an action, logging timesteps."""
         timestep = self._environment.step(action)
+        if self._episode_file is None:
+            # Each episode file must be readable on its own, so the first step
+            # of an episode is never compressed
+            self._last_serialized_sprites = {}
+        timestamp = self._t0 + 1e-9 * (time.perf_counter_ns() - self._t0_ns)
+        if type(action) in (int, float):
+            serialized_action = action
+        else:
+            serialized_action = _serialize(action)
         str_timestep = (
-            [['time', time.time()],
+            [['time', timestamp],
              ['reward', timestep.reward],
              ['step_type', timestep.step_type.value],
-             ['action', _serialize(action)],
+             ['action', serialized_action],
              ['meta_state', _serialize(self._environment.meta_state)],
              self._serialized_state()]
         )
-        self._episode_log.append(str_timestep)
-        
+        self._write_step(str_timestep)
+
         if timestep.last():
-            # Write the episode to a log file
+            self._close_episode_file()
+
+        return timestep
+
+    def _write_step(self, str_timestep):
+        """Append a serialized step to the current episode log file.
+
+        The episode log file is a json list, so the opening bracket is written
+        when the file is opened and steps are comma-separated. Steps are written
+        to a temporary file, which is only renamed to the episode filename once
+        the episode is complete, so every numerical file in the log directory is
+        a complete json list.
+        """
+        if self._episode_file is None:
             episode_count_str = str(self._episode_count).zfill(_FILENAME_ZFILL)
             filename = os.path.join(self._log_dir, episode_count_str)
             logging.info('Logging episode {} to {}.'.format(
                 self._episode_count, filename))
-            with open(filename, 'w') as f:
-                json.dump(self._episode_log, f)
-            self._episode_count += 1
-            self._episode_log = []
+            self._episode_filename = filename
+            self._episode_file = open(filename + _PARTIAL_SUFFIX, 'w')
+            self._episode_file.write('[')
+        else:
+            self._episode_file.write(',')
+        json.dump(str_timestep, self._episode_file)
 
-        return timestep
+    def _close_episode_file(self):
+        """Terminate the json list of the current episode and close the file."""
+        self._episode_file.write(']')
+        self._episode_file.close()
+        os.replace(
+            self._episode_filename + _PARTIAL_SUFFIX, self._episode_filename)
+        self._episode_file = None
+        self._episode_count += 1
+
+    def close(self):
+        """Close the logger, discarding the log of an unfinished episode.
+
+        Call this when the session ends in the middle of an episode. Only
+        episodes that reached their last step are logged.
+        """
+        if self._episode_file is not None:
+            self._episode_file.close()
+            os.remove(self._episode_filename + _PARTIAL_SUFFIX)
+            self._episode_file = None
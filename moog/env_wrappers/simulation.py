@@ -7,10 +7,55 @@ Note: If there is stochasticity in the environment (e.g. maybe your physics or
 game rules have randomness), this will only take samples at each simulation
 step, not representing the full distribution of possible simulations. You can
 step and pop many times to estimate the distribution of possibilities.
+
+Note: Snapshots are full copies of the environment components rather than deltas
+between simulation steps. Sprites are frequently modified in place in ways that
+cannot be observed by the sprite (e.g. through local aliases of their velocity
+arrays in physics, or through their metadata in game rules), so a journal of
+changes could silently miss modifications. Copies are instead made cheap (see
+Sprite.__deepcopy__()), and ForkSimulationEnvironment provides snapshots whose
+memory cost is only the pages modified after the snapshot.
 """
 
 import copy
+import io
+import multiprocessing
+import os
+import pickle
+import signal
+import types
 from moog import env_wrappers
+from moog import game_rules as gr
+from moog import physics as physics_lib
+
+# Component types whose attributes only change in reset(), if at all. Snapshots
+# never span a reset, so they share instances of these instead of copying them.
+# Types are matched exactly, so instances of subclasses that may add state are
+# still copied. Types that change in step(), e.g. DeterministicMazeWalk popping
+# its step velocities, must not be added here.
+_STATELESS_TYPES = frozenset([
+    gr.ChangeLayer,
+    gr.CreateSprites,
+    gr.Fixation,
+    gr.KeepNearCenter,
+    gr.ModifyMetaState,
+    gr.ModifyOnContact,
+    gr.ModifySprites,
+    gr.VanishByFilter,
+    gr.VanishOnContact,
+    physics_lib.Collision,
+    physics_lib.ConstantSpeed,
+    physics_lib.DistanceForce,
+    physics_lib.Drag,
+    physics_lib.DownGravity,
+    physics_lib.Gravity,
+    physics_lib.KineticFriction,
+    physics_lib.MazePhysics,
+    physics_lib.RandomForce,
+    physics_lib.RandomMazeWalk,
+    physics_lib.Tether,
+    physics_lib.TetherZippedLayers,
+])
 
 
 class SimulationEnvironment(env_wrappers.AbstractEnvironmentWrapper):
@@ -57,21 +102,58 @@ class SimulationEnvironment(env_wrappers.AbstractEnvironmentWrapper):
         if self._environment.reset_next_step:
             # Should not simulate across episode boundaries
             return None
-        self.stack.append({
-            'state': copy.deepcopy(self._environment.state),
-            'meta_state': copy.deepcopy(self._environment.meta_state),
-            'action_space': copy.deepcopy(self._environment.action_space),
-            'physics': copy.deepcopy(self._environment.physics),
-            'game_rules': copy.deepcopy(self._environment.game_rules),
-            'task': copy.deepcopy(self._environment.task),
-            'step_count': copy.deepcopy(self._environment.step_count),
-            'reset_next_step': copy.deepcopy(self._environment.reset_next_step),
-        })
+        # Copy all components in a single deepcopy call, so they share one memo
+        # and the generic dispatch is only entered once
+        self.stack.append(
+            copy.deepcopy(self._components(), self._shared_memo()))
         return super(SimulationEnvironment, self).step(action)
     
     def sim_pop(self, index=-1):
         """Pop and restore the state at index off the stack."""
-        restore_data = self.stack[index]
+        self._restore(self.stack[index])
+        del self.stack[index:]
+
+    def _components(self):
+        """Get dictionary of all environment components that a step changes."""
+        return {
+            'state': self._environment.state,
+            'meta_state': self._environment.meta_state,
+            'action_space': self._environment.action_space,
+            'physics': self._environment.physics,
+            'game_rules': self._environment.game_rules,
+            'task': self._environment.task,
+            'step_count': self._environment.step_count,
+            'reset_next_step': self._environment.reset_next_step,
+        }
+
+    def _shared_memo(self):
+        """Get deepcopy memo of component objects that snapshots can share.
+
+        These are objects that do not change within an episode, namely the
+        action spec(s) and stateless game rules and forces, so copying them
+        would only cost time. Containers of these (the game rules tuple,
+        physics, conditional rules) are still copied, because they may hold
+        stateful objects too.
+        """
+        action_spec = self._environment.action_space.action_spec()
+        if isinstance(action_spec, dict):
+            shared = list(action_spec.values())
+        else:
+            shared = [action_spec]
+
+        candidates = list(self._environment.game_rules)
+        physics = self._environment.physics
+        if type(physics) is physics_lib.Physics:
+            candidates.extend(f[0] for f in physics._forces)  #pylint: disable=protected-access
+            candidates.extend(physics._corrective_physics)  #pylint: disable=protected-access
+        else:
+            candidates.append(physics)
+        shared.extend(x for x in candidates if type(x) in _STATELESS_TYPES)
+
+        return {id(x): x for x in shared}
+
+    def _restore(self, restore_data):
+        """Restore environment components from the output of _components()."""
         self._environment._state = restore_data['state']
         self._environment.action_space = restore_data['action_space']
         self._environment.physics = restore_data['physics']
@@ -80,4 +162,190 @@ class SimulationEnvironment(env_wrappers.AbstractEnvironmentWrapper):
         self._environment._meta_state = restore_data['meta_state']  #pylint: disable=protected-access
         self._environment.step_count = restore_data['step_count']
         self._environment._reset_next_step = restore_data['reset_next_step']  #pylint: disable=protected-access
-        self.stack = self.stack[:index]
+
+
+class _FunctionReferencePickler(pickle.Pickler):
+    """Pickler that serializes functions by their id.
+
+    Environment components often hold lambdas or locally defined functions
+    (e.g. game rule conditions), which cannot be pickled. Like copy.deepcopy(),
+    this treats functions as atomic, recording only their id and qualified
+    name. This is only meaningful between processes forked from one another,
+    where functions created before the fork have the same id in both processes.
+    Hence only functions that exist in the parent process before sim_step() and
+    are still held by the environment when the snapshot is restored are
+    supported. A function created in the child process after the fork has no
+    counterpart in the parent process.
+    """
+
+    def __init__(self, file, functions=None):
+        super(_FunctionReferencePickler, self).__init__(
+            file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._functions = functions
+
+    def persistent_id(self, obj):
+        if type(obj) is types.FunctionType:
+            if self._functions is not None:
+                self._functions[id(obj)] = obj
+            return id(obj), obj.__qualname__
+        return None
+
+
+class _FunctionReferenceUnpickler(pickle.Unpickler):
+    """Unpickler for data pickled by _FunctionReferencePickler.
+
+    See _FunctionReferencePickler for which functions are supported. Function
+    references that cannot be resolved, or that resolve to a function with a
+    different qualified name (e.g. because its id was reused), raise
+    pickle.UnpicklingError.
+    """
+
+    def __init__(self, file, functions, register_functions):
+        """Constructor.
+
+        Args:
+            file: Binary file to unpickle from.
+            functions: Dictionary of functions keyed by id.
+            register_functions: Callable adding functions to the functions
+                dictionary. Called if a function id is not found.
+        """
+        super(_FunctionReferenceUnpickler, self).__init__(file)
+        self._functions = functions
+        self._register_functions = register_functions
+
+    def persistent_load(self, pid):
+        function_id, qualname = pid
+        if function_id not in self._functions:
+            self._register_functions()
+        function = self._functions.get(function_id)
+        if function is None or function.__qualname__ != qualname:
+            raise pickle.UnpicklingError(
+                'Cannot restore function {} from the snapshot. Only functions '
+                'that exist before sim_step() and are still held by the '
+                'environment can be restored, not functions created in the '
+                'snapshot process after the fork.'.format(qualname))
+        return function
+
+
+class _NullFile():
+    """Binary file that discards everything written to it."""
+
+    def write(self, data):
+        return len(data)
+
+
+class ForkSimulationEnvironment(SimulationEnvironment):
+    """Environment class supporting mental simulation with forked snapshots.
+
+    This has the same interface as SimulationEnvironment, but instead of deep
+    copying the environment at every sim_step(), it forks a child process that
+    holds the snapshot. The operating system shares memory pages copy-on-write
+    between the processes, so a snapshot only costs memory for the pages
+    subsequently modified, and sim_step() never copies the state. On sim_pop(),
+    the child process holding the restored snapshot pickles it back to this
+    process, and the child processes of all discarded snapshots are killed.
+
+    This is useful for deep simulation trees in which most snapshots are never
+    restored. It is only supported on platforms with os.fork(), and all
+    environment components except functions must be picklable. Functions are
+    restored by reference, so only functions that exist before sim_step() are
+    supported (see _FunctionReferencePickler).
+    """
+
+    def __init__(self, environment):
+        """Constructor.
+
+        Args:
+            environment: Instance of ../moog/environment.Environment.
+        """
+        super(ForkSimulationEnvironment, self).__init__(environment)
+        self.stack = []
+        # Functions in the environment components, keyed by id, used to restore
+        # function references when unpickling snapshots. This is populated
+        # lazily by self._register_functions().
+        self._functions = {}
+
+    def _register_functions(self):
+        """Register all functions in the current environment components."""
+        _FunctionReferencePickler(_NullFile(), self._functions).dump(
+            self._components())
+
+    def reset(self):
+        self._discard(self.stack)
+        return super(ForkSimulationEnvironment, self).reset()
+
+    def sim_step(self, action):
+        """Take a simulation step of the environment with an action."""
+        if self._environment.reset_next_step:
+            # Should not simulate across episode boundaries
+            return None
+        self.stack.append(self._fork_snapshot())
+        return super(SimulationEnvironment, self).step(action)
+
+    def sim_pop(self, index=-1):
+        """Pop and restore the state at index off the stack."""
+        if not -len(self.stack) <= index < len(self.stack):
+            raise IndexError(
+                'sim_pop index {} out of range for {} snapshots'.format(
+                    index, len(self.stack)))
+        if index < 0:
+            index += len(self.stack)
+        pid, conn = self.stack[index]
+        conn.send_bytes(b'pop')
+        try:
+            pickled = conn.recv_bytes()
+        except EOFError:
+            pickled = b''
+        conn.close()
+        os.waitpid(pid, 0)
+        if not pickled:
+            raise pickle.PicklingError(
+                'Could not pickle environment snapshot in child process.')
+
+        # Functions that have not been registered yet are registered while
+        # unpickling, so the snapshot is only unpickled once
+        restore_data = _FunctionReferenceUnpickler(
+            io.BytesIO(pickled), self._functions,
+            self._register_functions).load()
+        self._restore(restore_data)
+
+        self._discard(self.stack[index + 1:])
+        del self.stack[index:]
+
+    def _fork_snapshot(self):
+        """Fork a child process holding a snapshot of the environment.
+
+        Returns:
+            Tuple (pid, conn) of the child process id and the connection with
+                which to request the snapshot from the child process.
+        """
+        parent_conn, child_conn = multiprocessing.Pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Child process. Wait until the snapshot is requested or the parent
+            # connection is closed, then exit without running any cleanup
+            # handlers inherited from the parent.
+            parent_conn.close()
+            for _, conn in self.stack:
+                conn.close()
+            try:
+                if child_conn.recv_bytes() == b'pop':
+                    f = io.BytesIO()
+                    _FunctionReferencePickler(f).dump(self._components())
+                    child_conn.send_bytes(f.getvalue())
+            except BaseException:
+                pass
+            finally:
+                os._exit(0)
+        child_conn.close()
+        return pid, parent_conn
+
+    def _discard(self, snapshots):
+        """Kill the child processes holding snapshots."""
+        for pid, conn in snapshots:
+            conn.close()
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
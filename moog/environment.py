@@ -100,20 +100,27 @@ class Environment(dm_env.Environment):
         if self._reset_next_step:
             return self.reset()
 
+        # Hoist the state into locals for the rest of the step. The game rules,
+        # action space, physics, and task are deliberately looked up afresh
+        # every step, since they may be swapped out between steps (e.g. by
+        # ../env_wrappers/simulation.SimulationEnvironment.sim_pop()).
+        state = self._state
+        meta_state = self._meta_state
+
         # Apply the game_rules
         for rule in self.game_rules:
-            rule.step(self._state, self._meta_state)
+            rule.step(state, meta_state)
 
         # Apply the action
-        self.action_space.step(self._state, action)
+        self.action_space.step(state, action)
 
         # Step the physics
-        self.physics.step(self._state)
+        self.physics.step(state)
 
         # Compute reward
         self.step_count += 1
         reward, should_reset = self.task.reward(
-            self._state, self._meta_state, self.step_count)
+            state, meta_state, self.step_count)
 
         # Take observation
         observation = self.observation()
@@ -127,8 +134,8 @@ class Environment(dm_env.Environment):
 
     def observation(self):
         """Returns a dictionary of observations."""
-        return {k: observer(self._state)
-                for k, observer in self.observers.items()}
+        state = self._state
+        return {k: observer(state) for k, observer in self.observers.items()}
 
     def observation_spec(self):
         """Returns a dictionary of dm_env specs for the observations."""
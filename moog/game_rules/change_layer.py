@@ -1,7 +1,6 @@
 """Rules that move sprites from one layer to another."""
 
 from . import abstract_rule
-import numpy as np
 
 
 class ChangeLayer(abstract_rule.AbstractRule):
@@ -25,21 +24,29 @@ class ChangeLayer(abstract_rule.AbstractRule):
         """
         self._old_layer = old_layer
         self._new_layer = new_layer
-        
-        if filter_fn is None:
-            self._filter_fn =  lambda s: True
-        else:
-            self._filter_fn = filter_fn
+        self._filter_fn = filter_fn
 
     def step(self, state, meta_state):
         """Apply rule, potential moving sprites from old to new layer."""
         del meta_state
+
+        if self._filter_fn is None:
+            # No filter, so the whole layer moves
+            move = list(state[self._old_layer])
+            state[self._old_layer].clear()
+            state[self._new_layer].extend(move)
+            return
         
-        should_change = [self._filter_fn(s) for s in state[self._old_layer]]
-        change_inds = np.argwhere(should_change)[:, 0]
-
-        count_changed_already = 0
-        for i in change_inds:
-            state[self._new_layer].append(
-                state[self._old_layer].pop(i - count_changed_already))
-            count_changed_already += 1
+        # Partition the old layer in a single pass, instead of popping sprites
+        # one at a time, which shifts the tail of the layer for every pop
+        keep = []
+        move = []
+        for s in state[self._old_layer]:
+            if self._filter_fn(s):
+                move.append(s)
+            else:
+                keep.append(s)
+
+        if move:
+            state[self._old_layer][:] = keep
+            state[self._new_layer].extend(move)
@@ -38,21 +38,27 @@ class ConditionalRule(abstract_rule.AbstractRule):
                 int, indicates how many times to apply rule.
             rules: Instance of abstract_rule.AbstractRule or iterable of such.
         """
-        if len(inspect.signature(condition).parameters.values()) == 1:
-            self._condition = lambda state, meta_state: condition(state)
-        else:
-            self._condition = condition
+        # Record the arity of condition once, so that step() can call it
+        # directly instead of through a wrapper function
+        self._condition = condition
+        self._one_arg = (
+            len(inspect.signature(condition).parameters.values()) == 1)
         
         if not isinstance(rules, (list, tuple)):
-            self._rules = [rules]
+            self._rules = (rules,)
         else:
-            self._rules = rules
+            self._rules = tuple(rules)
 
     def reset(self, state, meta_state):
         for rule in self._rules:
             rule.reset(state, meta_state)
 
     def step(self, state, meta_state):
-        for _ in range(self._condition(state, meta_state)):
-            for rule in self._rules:
+        if self._one_arg:
+            num_applications = self._condition(state)
+        else:
+            num_applications = self._condition(state, meta_state)
+        rules = self._rules
+        for _ in range(num_applications):
+            for rule in rules:
                 rule.step(state, meta_state)
@@ -10,6 +10,72 @@ ConditionalRule.
 
 from . import abstract_rule
 import itertools
+from moog import sprite as sprite_lib
+import numpy as np
+
+# Relative slack for the bounding circle pre-filter in _bulk_overlap(), so that
+# the pre-filter never rejects a pair that Sprite.overlaps_sprite() would accept
+# due to floating point rounding differences.
+_BOUNDING_CIRCLE_SLACK = 1e-6
+
+
+def _bulk_overlap(sprites_0, sprites_1):
+    """Compute which pairs of sprites overlap.
+
+    Pairs are first rejected by their bounding circles, in one vectorized
+    operation over all pairs, and then by their axis-aligned bounding boxes,
+    which are much tighter for elongated sprites such as walls. Only the
+    remaining pairs are tested exactly with Sprite.overlaps_sprite().
+
+    Args:
+        sprites_0: List of sprites.
+        sprites_1: List of sprites.
+
+    Returns:
+        overlaps: Boolean numpy array of shape [len(sprites_0),
+            len(sprites_1)], where overlaps[i, j] is
+            sprites_0[i].overlaps_sprite(sprites_1[j]).
+    """
+    overlaps = np.zeros((len(sprites_0), len(sprites_1)), dtype=bool)
+    if not sprites_0 or not sprites_1:
+        return overlaps
+
+    positions_0 = np.array([s.position for s in sprites_0])
+    positions_1 = np.array([s.position for s in sprites_1])
+    radii_0 = np.array([s.max_radius for s in sprites_0])
+    radii_1 = np.array([s.max_radius for s in sprites_1])
+
+    # Per-axis differences keep all intermediates of shape [N, M]
+    dx = positions_0[:, 0, np.newaxis] - positions_1[np.newaxis, :, 0]
+    dy = positions_0[:, 1, np.newaxis] - positions_1[np.newaxis, :, 1]
+    max_dists = radii_0[:, np.newaxis] + radii_1[np.newaxis]
+    candidates = (
+        dx * dx + dy * dy <=
+        (1. + _BOUNDING_CIRCLE_SLACK) * max_dists * max_dists)
+    inds_0, inds_1 = np.nonzero(candidates)
+    if len(inds_0) == 0:
+        return overlaps
+
+    # Bounding boxes are only computed for sprites in candidate pairs
+    unique_0, inverse_0 = np.unique(inds_0, return_inverse=True)
+    unique_1, inverse_1 = np.unique(inds_1, return_inverse=True)
+    boxes_intersect = sprite_lib.bounding_boxes_overlap(
+        [sprites_0[i] for i in unique_0.tolist()],
+        [sprites_1[i] for i in unique_1.tolist()],
+    )[inverse_0, inverse_1]
+
+    for i_0, i_1 in zip(inds_0[boxes_intersect].tolist(),
+                        inds_1[boxes_intersect].tolist()):
+        overlaps[i_0, i_1] = sprites_0[i_0].overlaps_sprite(sprites_1[i_1])
+    return overlaps
+
+
+def _filter_indices(sprites, contacting, filter_fn):
+    """Get indices of contacting sprites that satisfy filter_fn, if any."""
+    indices = np.flatnonzero(contacting).tolist()
+    if filter_fn is not None:
+        indices = [i for i in indices if filter_fn(sprites[i])]
+    return indices
 
 
 def get_contact_indices(layer_0, layer_1):
@@ -27,11 +93,13 @@ def get_contact_indices(layer_0, layer_1):
 
     def _call(state):
         """Gets all (i_0, i_1) such that layer_0[i_0] contacts layer_1[i_1]."""
-        contact_indices = []
-        for i_0, sprite_0 in enumerate(state[layer_0]):
-            for i_1, sprite_1 in enumerate(state[layer_1]):
-                if sprite_0.overlaps_sprite(sprite_1):
-                    contact_indices.append((i_0, i_1))
+        sprites_0 = state[layer_0]
+        sprites_1 = state[layer_1]
+        if not sprites_0 or not sprites_1:
+            return []
+        overlaps = _bulk_overlap(sprites_0, sprites_1)
+        contact_indices = [
+            (i_0, i_1) for i_0, i_1 in np.argwhere(overlaps).tolist()]
         return contact_indices
     return _call
 
@@ -88,11 +156,9 @@ class ModifyOnContact(abstract_rule.AbstractRule):
         self._modifier_0 = modifier_0
         self._modifier_1 = modifier_1
 
-        if filter_0 is None:
-            filter_0 = lambda x: True
+        # Filters may be None, in which case every contacting sprite is
+        # modified without calling a filter per sprite
         self._filter_0 = filter_0
-        if filter_1 is None:
-            filter_1 = lambda x: True
         self._filter_1 = filter_1
 
     def _modify_asymmetric(self, sprites_modifying, sprites_contacting,
@@ -100,7 +166,7 @@ class ModifyOnContact(abstract_rule.AbstractRule):
         """Modify sprites_modifying if contcating sprites_contacting."""
         if modifier is not None:
             for s in sprites_modifying:
-                if not filter(s):
+                if filter is not None and not filter(s):
                     continue
                 contacts = [s.overlaps_sprite(x) for x in sprites_contacting
                             if id(x) != id(s)]
@@ -110,11 +176,43 @@ class ModifyOnContact(abstract_rule.AbstractRule):
     def step(self, state, meta_state):
         """Apply rule to state."""
         del meta_state
+
+        if self._modifier_0 is None and self._modifier_1 is None:
+            return
         
-        sprites_0 = list(itertools.chain(*[state[k] for k in self._layers_0]))
-        sprites_1 = list(itertools.chain(*[state[k] for k in self._layers_1]))
-        
-        self._modify_asymmetric(
-            sprites_0, sprites_1, self._modifier_0, self._filter_0)
-        self._modify_asymmetric(
-            sprites_1, sprites_0, self._modifier_1, self._filter_1)
+        sprites_0 = list(itertools.chain.from_iterable(
+            state[k] for k in self._layers_0))
+        sprites_1 = list(itertools.chain.from_iterable(
+            state[k] for k in self._layers_1))
+        if not sprites_0 or not sprites_1:
+            # No contacts are possible
+            return
+
+        if not set(map(id, sprites_0)).isdisjoint(map(id, sprites_1)):
+            # The layers share sprites, so modifying a sprite can change the
+            # contacts of sprites scanned after it. Scan sequentially.
+            self._modify_asymmetric(
+                sprites_0, sprites_1, self._modifier_0, self._filter_0)
+            self._modify_asymmetric(
+                sprites_1, sprites_0, self._modifier_1, self._filter_1)
+            return
+
+        # Compute all contacts once, to drive both modifiers
+        contacts = _bulk_overlap(sprites_0, sprites_1)
+
+        if self._modifier_0 is not None:
+            modified = _filter_indices(
+                sprites_0, contacts.any(axis=1), self._filter_0)
+            for i_0 in modified:
+                self._modifier_0(sprites_0[i_0])
+
+            if modified and self._modifier_1 is not None:
+                # The modified sprites may have moved or changed shape, so
+                # recompute their contacts
+                contacts[modified] = _bulk_overlap(
+                    [sprites_0[i_0] for i_0 in modified], sprites_1)
+
+        if self._modifier_1 is not None:
+            for i_1 in _filter_indices(
+                    sprites_1, contacts.any(axis=0), self._filter_1):
+                self._modifier_1(sprites_1[i_1])
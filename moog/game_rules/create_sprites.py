@@ -28,7 +28,7 @@ class CreateSprites(abstract_rule.AbstractRule):
         """Apply rule to state."""
         del meta_state
         
-        without_overlapping = list(itertools.chain(
-            *[state[k] for k in self._without_overlapping]))
+        without_overlapping = list(itertools.chain.from_iterable(
+            state[k] for k in self._without_overlapping))
         new_sprite = self._generator(without_overlapping=without_overlapping)
         state[self._layer].extend(new_sprite)
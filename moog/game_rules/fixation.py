@@ -11,7 +11,6 @@ order to proceed with the task.
 """
 
 from . import abstract_rule
-import numpy as np
 
 
 class Fixation(abstract_rule.AbstractRule):
@@ -37,7 +36,7 @@ class Fixation(abstract_rule.AbstractRule):
         """
         self._agent_layer = agent_layer
         self._fixation_layer = fixation_layer
-        self._fixation_threshold = fixation_threshold
+        self._fixation_threshold_squared = fixation_threshold ** 2
         self._meta_state_fixation_key = meta_state_fixation_key
 
     def reset(self, state, meta_state):
@@ -47,8 +46,13 @@ class Fixation(abstract_rule.AbstractRule):
     def step(self, state, meta_state):
         agent = state[self._agent_layer][0]
         target = state[self._fixation_layer][0]
-        dist = np.linalg.norm(agent.position - target.position)
-        if dist < self._fixation_threshold:
+        # Compare squared distance in scalar arithmetic, avoiding numpy dispatch
+        # and a square root for these 2-vectors
+        agent_x, agent_y = agent.position.tolist()
+        target_x, target_y = target.position.tolist()
+        dx = agent_x - target_x
+        dy = agent_y - target_y
+        if dx * dx + dy * dy < self._fixation_threshold_squared:
             meta_state[self._meta_state_fixation_key] += 1
         else:
             meta_state[self._meta_state_fixation_key] = 0
@@ -5,7 +5,6 @@ position to another.
 """
 
 from . import abstract_rule
-import numpy as np
 
 
 class Portal(abstract_rule.AbstractRule):
@@ -52,25 +51,30 @@ class Portal(abstract_rule.AbstractRule):
             raise ValueError(
                 'There must be an even number of portals, but you have {} '
                 'portals.'.format(num_portals))
-        
+
+        currently_teleporting = self._currently_teleporting
         for sprite in state[self._teleporting_layer]:
-            in_portals = [portal.contains_point(sprite.position)
-                          for portal in portals]
-            in_portal_inds = np.argwhere(in_portals)[:, 0]
+            # Find the first portal containing the sprite, if any
+            position = sprite.position
+            entry_ind = -1
+            for i, portal in enumerate(portals):
+                if portal.contains_point(position):
+                    entry_ind = i
+                    break
 
-            if len(in_portal_inds) == 0:
+            if entry_ind == -1:
                 # Sprite is not in any portal, so make sure we don't think
                 # sprite is currently teleporting
-                self._currently_teleporting.discard(sprite.id)
+                currently_teleporting.discard(sprite.id)
                 continue
 
-            if sprite.id in self._currently_teleporting:
+            if sprite.id in currently_teleporting:
                 # To prevent immediately teleporting back and forth between
                 # portals
                 continue
             
-            # Teleport the sprite
-            entry_ind = in_portal_inds[0]
-            exit_ind = entry_ind - 1 if entry_ind % 2 else entry_ind + 1
-            sprite.position = np.copy(portals[exit_ind].position)
-            self._currently_teleporting.add(sprite.id)
+            # Teleport the sprite to the paired portal, i.e. 0 <--> 1,
+            # 2 <--> 3, etc.
+            exit_ind = entry_ind ^ 1
+            sprite.position = portals[exit_ind].position.copy()
+            currently_teleporting.add(sprite.id)
@@ -45,7 +45,7 @@ class KeepNearCenter(abstract_rule.AbstractRule):
     
         if grid_y is None:
             grid_y = grid_x
-        self._grid_cell = np.array([grid_x, grid_y])
+        self._grid_cell = (grid_x, grid_y)
 
     def _move_sprites(self, state, delta_pos):
         for layer in self._layers_to_center:
@@ -57,11 +57,16 @@ class KeepNearCenter(abstract_rule.AbstractRule):
         del meta_state
         
         agent = state[self._agent_layer][0]
-        agent_pos = agent.position - np.array([0.5, 0.5])
-        delta_pos = (
-            -1. * self._grid_cell * (agent_pos > self._grid_cell) + 
-            self._grid_cell * (agent_pos < -1. * self._grid_cell)
-        )
+        # The agent position has only two components, so scalar arithmetic is
+        # faster than numpy here
+        agent_x, agent_y = agent.position.tolist()
+        agent_x -= 0.5
+        agent_y -= 0.5
+        grid_x, grid_y = self._grid_cell
+        delta_x = -grid_x if agent_x > grid_x else (
+            grid_x if agent_x < -grid_x else 0.)
+        delta_y = -grid_y if agent_y > grid_y else (
+            grid_y if agent_y < -grid_y else 0.)
 
-        if any(delta_pos):
-            self._move_sprites(state, delta_pos)
+        if delta_x or delta_y:
+            self._move_sprites(state, np.array([delta_x, delta_y]))
@@ -8,6 +8,7 @@ temporal duration.
 
 from . import abstract_rule
 import inspect
+import itertools
 import numpy as np
 
 
@@ -53,12 +54,11 @@ class Phase():
         else:
             self._continual_rules = continual_rules
         
-        if end_condition is None:
-            self._end_condition = lambda state, meta_state: False
-        elif len(inspect.signature(end_condition).parameters.values()) == 1:
-            self._end_condition = lambda state, meta_state: end_condition(state)
-        else:
-            self._end_condition =  end_condition
+        # Record the arity of end_condition once, so that step() can call it
+        # directly instead of through a wrapper function
+        self._end_condition = end_condition
+        self._one_arg = end_condition is not None and (
+            len(inspect.signature(end_condition).parameters.values()) == 1)
 
         if not callable(duration):
             self._duration =  lambda: duration
@@ -69,7 +69,8 @@ class Phase():
 
     def reset(self, state, meta_state):
         """Reset at beginning of episode."""
-        for rule in list(self._one_time_rules) + list(self._continual_rules):
+        for rule in itertools.chain(
+                self._one_time_rules, self._continual_rules):
             rule.reset(state=state, meta_state=meta_state)
         self._should_end = False
         self._step_count = 0
@@ -77,21 +78,28 @@ class Phase():
 
     def step(self, state, meta_state):
         """Step rule on environment state and meta_state."""
-        if self.should_end:
+        if self._should_end:
             return
         
-        if self._step_count == 0:
+        step_count = self._step_count
+        if step_count == 0:
             for rule in self._one_time_rules:
-                rule.step(state=state, meta_state=meta_state)
+                rule.step(state, meta_state)
         
         for rule in self._continual_rules:
-            rule.step(state=state, meta_state=meta_state)
+            rule.step(state, meta_state)
         
-        self._step_count += 1
+        step_count += 1
+        self._step_count = step_count
 
-        if (self._step_count >= self._current_duration or
-                self._end_condition(state, meta_state)):
+        end_condition = self._end_condition
+        if step_count >= self._current_duration:
             self._should_end = True
+        elif end_condition is not None:
+            if self._one_arg:
+                self._should_end = bool(end_condition(state))
+            else:
+                self._should_end = bool(end_condition(state, meta_state))
 
     @property
     def should_end(self):
@@ -131,11 +139,14 @@ class PhaseSequence():
 
     def step(self, state, meta_state):
         if self._current_phase_ind >= len(self._phases):
-            pass
+            # All phases have ended
+            return
         
-        self._current_phase.step(state=state, meta_state=meta_state)
+        self._current_phase.step(state, meta_state)
         if self._current_phase.should_end:
             self._current_phase_ind += 1
+            if self._current_phase_ind >= len(self._phases):
+                return
             self._current_phase = self._phases[self._current_phase_ind]
             if self._meta_state_key is not None:
                 meta_state[self._meta_state_key] = self._current_phase.name
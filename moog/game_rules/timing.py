@@ -53,11 +53,16 @@ class TimedRule(abstract_rule.AbstractRule):
 
     def step(self, state, meta_state):
         """Apply rule to state."""
-        if self._steps_until_start <= 0 and self._steps_until_stop > 0:
+        steps_until_stop = self._steps_until_stop
+        if steps_until_stop <= 0:
+            # The interval is over, so the counters no longer matter
+            return
+        steps_until_start = self._steps_until_start
+        if steps_until_start <= 0:
             for rule in self._rules:
                 rule.step(state, meta_state)
-        self._steps_until_start -= 1
-        self._steps_until_stop -= 1
+        self._steps_until_start = steps_until_start - 1
+        self._steps_until_stop = steps_until_stop - 1
 
 
 class DelayedRule(TimedRule):
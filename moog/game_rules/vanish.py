@@ -3,7 +3,6 @@
 from . import abstract_rule
 from .contact_rules import get_contact_indices
 import abc
-import numpy as np
 
 
 class Vanish(abstract_rule.AbstractRule, metaclass=abc.ABCMeta):
@@ -32,11 +31,15 @@ class Vanish(abstract_rule.AbstractRule, metaclass=abc.ABCMeta):
         """Remove sprites in specified indices of vanishing layer."""
         del meta_state
         
-        vanish_inds = self._get_vanish_inds(state)
-        count_vanished_already = 0
-        for i in vanish_inds:
-            state[self._layer].pop(i - count_vanished_already)
-            count_vanished_already += 1
+        vanish_inds = set(self._get_vanish_inds(state))
+        if not vanish_inds:
+            return
+
+        # Rebuild the layer in place in a single pass, instead of popping
+        # sprites one at a time, which shifts the tail of the layer for every
+        # pop
+        layer = state[self._layer]
+        layer[:] = [s for i, s in enumerate(layer) if i not in vanish_inds]
 
 
 class VanishByFilter(Vanish):
@@ -54,14 +57,13 @@ class VanishByFilter(Vanish):
                 defaults to True, i.e. vanishing all sprites in layer.
         """
         super(VanishByFilter, self).__init__(layer)
-        if filter_fn is None:
-            self._filter_fn = lambda _: True
-        else:
-            self._filter_fn = filter_fn
+        self._filter_fn = filter_fn
 
     def _get_vanish_inds(self, state):
-        vanish_inds = np.argwhere(
-            [self._filter_fn(s) for s in state[self._layer]])[:, 0]
+        if self._filter_fn is None:
+            return range(len(state[self._layer]))
+        vanish_inds = [
+            i for i, s in enumerate(state[self._layer]) if self._filter_fn(s)]
         return vanish_inds
 
 
@@ -83,4 +85,4 @@ class VanishOnContact(Vanish):
 
     def _get_vanish_inds(self, state):
         contact_inds = self._get_contact_indices(state)
-        return np.unique([i for (i, j) in contact_inds])
+        return {i for (i, _) in contact_inds}
@@ -5,6 +5,7 @@ maze array and sprites, including methods to infer a maze from sprites, convert
 a maze to sprites, and sample points or connected blobs in the maze.
 """
 
+import itertools
 import numpy as np
 from moog import sprite
 
@@ -34,6 +35,9 @@ class Maze():
         self.half_grid_side = 0.5 * self.grid_side
         self.side_vertices = np.linspace(
             self.half_grid_side, 1. - self.half_grid_side, self.maze_size)
+        # Cache for self._cached()
+        self._cached_maze = None
+        self._cache = {}
 
     @classmethod
     def from_state(cls, state, maze_layer='walls'):
@@ -50,7 +54,12 @@ class Maze():
             maze_layer: String. Layer in the environment containing the maze
                 wall sprites.
         """
-        wall_vertices = np.array([s.vertices for s in state[maze_layer]])
+        walls = state[maze_layer]
+        all_wall_vertices = np.array([s.vertices for s in walls])
+
+        # Wall sprites share most of their vertex coordinates, so only the
+        # distinct coordinate values need checking
+        wall_vertices = np.unique(all_wall_vertices)
         
         # Find the smallest maze size N such that all wall vertices are a
         # multiple of 1/N
@@ -74,9 +83,15 @@ class Maze():
         grid_centers = np.stack(np.meshgrid(edge_centers, edge_centers), axis=2)
         flat_grid_centers = np.reshape(grid_centers, (maze_size * maze_size, 2))
 
-        # Now check which grid square centerpoints are inside walls
-        maze = np.zeros(maze_size * maze_size, dtype=bool)
-        for s in state[maze_layer]:
+        # Now check which grid square centerpoints are inside walls. Walls that
+        # are axis-aligned rectangles (e.g. those made by self.to_sprites())
+        # contain exactly the centerpoints strictly between their edges, so
+        # these are filled in all at once.
+        is_rectangle = _is_axis_aligned_rectangle(
+            all_wall_vertices, edge_centers)
+        maze = _fill_rectangles(
+            all_wall_vertices[is_rectangle], edge_centers).ravel()
+        for s in itertools.compress(walls, ~is_rectangle):
             contained = s.contains_points(flat_grid_centers)
             maze = np.logical_or(maze, contained)
 
@@ -97,18 +112,22 @@ class Maze():
         """
         maze_size = self.maze_size
         vertex_linspace = np.linspace(0., 1., maze_size + 1)
-        sprites = []
-        for x in range(maze_size):
-            for y in range(maze_size):
-                if self.maze[y, x]:
-                    shape = np.array([
-                        [vertex_linspace[x], vertex_linspace[y]],
-                        [vertex_linspace[x], vertex_linspace[y + 1]],
-                        [vertex_linspace[x + 1], vertex_linspace[y + 1]],
-                        [vertex_linspace[x + 1], vertex_linspace[y]],
-                    ])
-                    new_sprite = sprite.Sprite(x=0., y=0., shape=shape, **color)
-                    sprites.append(new_sprite)
+
+        # Build the shapes of all wall cells at once, ordered by x then y
+        xs, ys = np.nonzero(np.transpose(self.maze))
+        x_0 = vertex_linspace[xs]
+        x_1 = vertex_linspace[xs + 1]
+        y_0 = vertex_linspace[ys]
+        y_1 = vertex_linspace[ys + 1]
+        shapes = np.stack([
+            np.stack([x_0, y_0], axis=1),
+            np.stack([x_0, y_1], axis=1),
+            np.stack([x_1, y_1], axis=1),
+            np.stack([x_1, y_0], axis=1),
+        ], axis=1)
+
+        sprites = [
+            sprite.Sprite(x=0., y=0., shape=shape, **color) for shape in shapes]
         return sprites
 
     def open_vertex(self, i, j):
@@ -120,32 +139,79 @@ class Maze():
 
     def valid_directions(self, i, j):
         """Computes the open neighbords of the (i, j) cell."""
+        # This is called every step by maze physics, so self.open_vertex() is
+        # inlined
+        maze = self.maze
+        size = self.maze_size
+        i_in_maze = 0 <= i < size
+        j_in_maze = 0 <= j < size
         valid_directions = np.array([
-            [self.open_vertex(k, j) for k in [i - 1, i + 1]],
-            [self.open_vertex(i, k) for k in [j - 1, j + 1]],
+            [j_in_maze and 0 < i <= size and not maze[j, i - 1],
+             j_in_maze and -1 <= i < size - 1 and not maze[j, i + 1]],
+            [i_in_maze and 0 < j <= size and not maze[j - 1, i],
+             i_in_maze and -1 <= j < size - 1 and not maze[j + 1, i]],
         ])
         return valid_directions
 
+    def _cached(self, key, compute_fn):
+        """Get a cached value derived from self.maze.
+
+        The cache is cleared whenever self.maze has changed since the cached
+        values were computed, so values derived from the maze can be reused
+        across calls without tracking modifications of the maze.
+
+        Args:
+            key: Hashable. Key of the value in the cache.
+            compute_fn: Function with no arguments that computes the value.
+
+        Returns:
+            The cached or newly computed value.
+        """
+        if (self._cached_maze is None or
+                not np.array_equal(self._cached_maze, self.maze)):
+            self._cached_maze = self.maze.copy()
+            self._cache = {}
+        if key not in self._cache:
+            self._cache[key] = compute_fn()
+        return self._cache[key]
+
+    def _get_open_points(self):
+        """Get int numpy array of (i, j) indices of all open points."""
+        return self._cached('open_points', lambda: np.argwhere(self.maze == 0))
+
+    def _get_edges(self):
+        """Get horizontal and vertical edges between open cells of the maze.
+
+        Returns:
+            h_edges: Int numpy array of shape [num_h_edges, 2]. The (x, y)
+                indices of the cell with smaller x of each horizontal edge.
+            v_edges: Int numpy array of shape [num_v_edges, 2]. The (x, y)
+                indices of the cell with smaller y of each vertical edge.
+        """
+        def _compute_edges():
+            is_open = self.maze == 0
+            v_edges = np.logical_and(is_open[1:], is_open[:-1])
+            h_edges = np.logical_and(is_open[:, 1:], is_open[:, :-1])
+            v_edges = np.stack(np.nonzero(v_edges)[::-1]).T
+            h_edges = np.stack(np.nonzero(h_edges)[::-1]).T
+            return h_edges, v_edges
+        return self._cached('edges', _compute_edges)
+
     def sample_random_position(self, off_intersection=True):
         """Sample random open position on the edges of the maze."""
-        # First find edges
-        neg_maze = 1 - self.maze
-        v_edges = np.logical_and(neg_maze[1:], neg_maze[:-1])
-        h_edges = np.logical_and(neg_maze[:, 1:], neg_maze[:, :-1])
-        v_edges = np.stack(np.nonzero(v_edges)[::-1]).T
-        h_edges = np.stack(np.nonzero(h_edges)[::-1]).T
+        h_edges, v_edges = self._get_edges()
         num_h_edges = len(h_edges)
         num_v_edges = len(v_edges)
         num_edges = num_h_edges + num_v_edges
         if np.random.rand() < float(num_h_edges) / num_edges:
             # Pick a horizontal edge
-            edge = h_edges[np.random.choice(num_h_edges)]
+            edge = h_edges[np.random.randint(num_h_edges)]
             position = edge
             if off_intersection:
                 position = edge + np.random.rand() * np.array([1., 0.])
         else:
             # Pick a vertical edge
-            edge = v_edges[np.random.choice(num_v_edges)]
+            edge = v_edges[np.random.randint(num_v_edges)]
             position = edge
             if off_intersection:
                 position = edge + np.random.rand() * np.array([0., 1.])
@@ -191,9 +257,9 @@ class Maze():
         Returns:
             Tuple of integers (i, j), coordinates of open point.
         """
-        if np.sum(1 - self.maze) == 0:
+        candidates = self._get_open_points()
+        if len(candidates) == 0:
             raise ValueError('Maze has no open point.')
-        candidates = np.argwhere(self.maze == 0)
         point = candidates[np.random.randint(len(candidates))]
         return tuple(point)
 
@@ -206,9 +272,9 @@ class Maze():
         Returns:
             Tuple of integers (i, j), coordinates of open point.
         """
-        if np.sum(1 - self.maze) < num_points:
+        candidates = self._get_open_points()
+        if len(candidates) < num_points:
             raise ValueError('Maze has no open point.')
-        candidates = np.argwhere(self.maze == 0)
         inds = np.random.choice(len(candidates), size=num_points, replace=False)
         points = [tuple(candidates[i]) for i in inds]
         return points
@@ -233,11 +299,25 @@ class Maze():
             neighbor_dict: Keys are int tuples (i, j) and values are lists of
                 int tuples for all open neighbors of (i, j).
         """
-        neighbor_dict = {
-            (i, j): self.get_neighbors(i, j)
-            for i in range(self.maze_size)
-            for j in range(self.maze_size)
-        }
+        # Masks of whether each point has an open neighbor in each direction,
+        # in the same order as self.get_neighbors()
+        size = self.maze_size
+        is_open = np.logical_not(self.maze)
+        has_neighbor = np.zeros((4, size, size), dtype=bool)
+        has_neighbor[0, 1:] = is_open[:-1]
+        has_neighbor[1, :-1] = is_open[1:]
+        has_neighbor[2, :, 1:] = is_open[:, :-1]
+        has_neighbor[3, :, :-1] = is_open[:, 1:]
+        # Offsets of the neighbor in each direction in the flattened maze
+        flat_offsets = (-size, size, -1, 1)
+
+        points = [(i, j) for i in range(size) for j in range(size)]
+        neighbors = [[] for _ in points]
+        for offset, has_neighbor_in_direction in zip(
+                flat_offsets, has_neighbor):
+            for k in np.flatnonzero(has_neighbor_in_direction).tolist():
+                neighbors[k].append(points[k + offset])
+        neighbor_dict = dict(zip(points, neighbors))
         return neighbor_dict
 
     def add_wall(self, x_range, y_range):
@@ -255,7 +335,70 @@ class Maze():
         Warning: This could distrupt properties of the maze. For example, if the
         maze originally had no dead ends, this could introduce dead ends.
         """
-        self.maze[0, :] = 1
-        self.maze[-1, :] = 1
-        self.maze[:, 0] = 1
-        self.maze[:, -1] = 1
+        self.maze[[0, -1], :] = 1
+        self.maze[:, [0, -1]] = 1
+
+
+def _is_axis_aligned_rectangle(vertices, edge_centers):
+    """Check which polygons are axis-aligned rectangles off the grid centers.
+
+    A polygon is an axis-aligned rectangle if it has four vertices, each at a
+    corner of its bounding box, and each edge changes exactly one coordinate.
+    Grid centerpoints exactly on an edge are ambiguous, so rectangles with an
+    edge through grid centerpoints are excluded.
+
+    Args:
+        vertices: Numpy array of shape [num_polygons, num_vertices, 2].
+        edge_centers: Numpy array of grid centerpoint coordinates along each
+            axis.
+
+    Returns:
+        Boolean numpy array of shape [num_polygons].
+    """
+    num_polygons = len(vertices)
+    if num_polygons == 0 or vertices.ndim != 3 or vertices.shape[1] != 4:
+        return np.zeros(num_polygons, dtype=bool)
+    mins = vertices.min(axis=1, keepdims=True)
+    maxs = vertices.max(axis=1, keepdims=True)
+    on_corners = np.all((vertices == mins) | (vertices == maxs), axis=(1, 2))
+    edges = vertices - np.roll(vertices, 1, axis=1)
+    axis_aligned = np.all(np.sum(edges == 0, axis=2) == 1, axis=1)
+    off_centers = ~np.any(np.isin(vertices, edge_centers), axis=(1, 2))
+    return on_corners & axis_aligned & off_centers
+
+
+def _fill_rectangles(vertices, edge_centers):
+    """Get which grid centerpoints are strictly inside any of the rectangles.
+
+    Args:
+        vertices: Numpy array of shape [num_rectangles, 4, 2]. Vertices of
+            axis-aligned rectangles.
+        edge_centers: Sorted numpy array of grid centerpoint coordinates along
+            each axis.
+
+    Returns:
+        Boolean numpy array of shape [len(edge_centers), len(edge_centers)],
+            indexed by [y, x].
+    """
+    size = len(edge_centers)
+    if len(vertices) == 0:
+        return np.zeros((size, size), dtype=bool)
+    mins = vertices.min(axis=1)
+    maxs = vertices.max(axis=1)
+
+    # Index ranges of the centerpoints strictly inside each rectangle
+    starts = np.searchsorted(edge_centers, mins, side='right')
+    stops = np.searchsorted(edge_centers, maxs, side='left')
+
+    # Mark the rectangles with a 2D difference array, which accumulates to the
+    # number of rectangles covering each centerpoint
+    nonempty = np.all(starts < stops, axis=1)
+    starts = starts[nonempty]
+    stops = stops[nonempty]
+    coverage = np.zeros((size + 1, size + 1), dtype=int)
+    np.add.at(coverage, (starts[:, 1], starts[:, 0]), 1)
+    np.add.at(coverage, (starts[:, 1], stops[:, 0]), -1)
+    np.add.at(coverage, (stops[:, 1], starts[:, 0]), -1)
+    np.add.at(coverage, (stops[:, 1], stops[:, 0]), 1)
+    filled = np.cumsum(np.cumsum(coverage, axis=0), axis=1)[:-1, :-1] > 0
+    return filled
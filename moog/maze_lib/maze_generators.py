@@ -8,6 +8,9 @@ import numpy as np
 
 # Maximum iteration through a while loop
 _MAX_ITERS = int(1e5)
+# Number of consecutive rejected blob candidates after which to check whether
+# the blob can grow at all
+_BLOB_GROWTH_CHECK_PERIOD = 32
 
 
 def _get_neighbors(size, point):
@@ -26,9 +29,17 @@ def _get_neighbors(size, point):
     """
     i, j = point
 
-    neighbors = [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
-    _valid_neighbor = lambda neighbor: all(0 <= x < size for x in neighbor)
-    neighbors = list(filter(_valid_neighbor, neighbors))
+    neighbors = []
+    if 0 <= j < size:
+        if 0 < i <= size:
+            neighbors.append((i - 1, j))
+        if -1 <= i < size - 1:
+            neighbors.append((i + 1, j))
+    if 0 <= i < size:
+        if 0 < j <= size:
+            neighbors.append((i, j - 1))
+        if -1 <= j < size - 1:
+            neighbors.append((i, j + 1))
     
     return neighbors
 
@@ -72,26 +83,63 @@ def _remove_dead_ends(maze):
     Args:
         maze: N x N binary matrix.
     """
-    def _fill_maze():
-        # Fill in dead ends, return True if the maze has no dead ends, otherwise
-        # False.
-        size = maze.shape[0]
-        for i in range(size):
-            for j in range(size):
-                if maze[i, j]:  # Not an open point
-                    continue
-                num_open_neighbors = np.sum(
-                    [1 - maze[n[0], n[1]]
-                    for n in _get_neighbors(size, (i, j))])
-                if num_open_neighbors < 2:
-                    maze[i, j] = 1
-                    return False
-        return True
+    # Filling a dead end can only reduce the open-neighbor counts of other
+    # cells, so all current dead ends can be filled at once and the result
+    # does not depend on the filling order.
+    while True:
+        is_open = maze == 0
+        num_open_neighbors = np.zeros(maze.shape, dtype=np.int8)
+        num_open_neighbors[1:, :] += is_open[:-1, :]
+        num_open_neighbors[:-1, :] += is_open[1:, :]
+        num_open_neighbors[:, 1:] += is_open[:, :-1]
+        num_open_neighbors[:, :-1] += is_open[:, 1:]
+        dead_ends = is_open & (num_open_neighbors < 2)
+        if not dead_ends.any():
+            return
+        maze[dead_ends] = 1
+
+
+def _is_connected(maze):
+    """Check whether the open points of a maze form one connected component.
+
+    This uses a union-find over the open points, joining each open point with
+    its open neighbors below and to the right.
+
+    Args:
+        maze: N x N binary matrix.
+
+    Returns:
+        Bool. False if the maze has no open points or more than one connected
+            component of open points, otherwise True.
+    """
+    size = maze.shape[1]
+    open_inds = np.flatnonzero(maze == 0).tolist()
+    if not open_inds:
+        return False
+    is_open = set(open_inds)
+    parent = {k: k for k in open_inds}
+
+    def _find(k):
+        # Find the root of k, halving the path along the way
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for k in open_inds:
+        neighbors = [k + size]
+        if (k + 1) % size:
+            neighbors.append(k + 1)
+        for neighbor in neighbors:
+            if neighbor in is_open:
+                root_k = _find(k)
+                root_neighbor = _find(neighbor)
+                if root_k != root_neighbor:
+                    parent[root_neighbor] = root_k
+
+    num_components = len(set(_find(k) for k in open_inds))
+    return num_components == 1
 
-    valid_maze = False
-    while not valid_maze:
-        valid_maze = _fill_maze()
-    
 
 def generate_random_maze_matrix(size, ambient_size=None):
     """Generate a random maze matrix.
@@ -112,16 +160,25 @@ def generate_random_maze_matrix(size, ambient_size=None):
             `size` to add some visible wall border around the maze. If None, no
             wall border around the maze is produced.
     """
-    maze = np.ones((size, size))
+    # Build the maze as uint8 and only convert to float when returning it
+    maze = np.ones((size, size), dtype=np.uint8)
 
     # Start from a random point and recursively open points
     closed_neighbors = []  # Closed points that are neighbors of open points
+    # Mask of points that have been added to closed_neighbors, for constant-time
+    # membership checks
+    in_closed_neighbors = np.zeros((size, size), dtype=bool)
+    # Number of open points in each 2x2 block, indexed by its top-left corner
+    block_open_counts = np.zeros((size - 1, size - 1), dtype=np.int8)
     
     def _open_point(point):
         # Open a point and add its neighbors to closed_neighbors
         for p in _get_neighbors(size, point):
-            if maze[p[0], p[1]] and p not in closed_neighbors:
+            if maze[p] and not in_closed_neighbors[p]:
+                in_closed_neighbors[p] = True
                 closed_neighbors.append(p)
+        for block in _get_containing_blocks(size, point):
+            block_open_counts[block] += 1
         maze[point[0], point[1]] = 0
 
     def _find_and_open_new_point():
@@ -132,10 +189,10 @@ def generate_random_maze_matrix(size, ambient_size=None):
         for new_point in closed_neighbors:
             if not maze[new_point[0], new_point[1]]:
                 continue
-            will_make_open_block = any([
-                np.sum(maze[i: i + 2, j: j + 2]) <= 1
-                for i, j in _get_containing_blocks(size, new_point)
-            ])
+            will_make_open_block = any(
+                block_open_counts[block] >= 3
+                for block in _get_containing_blocks(size, new_point)
+            )
             if not will_make_open_block:
                 _open_point(new_point)
                 return True
@@ -150,61 +207,72 @@ def generate_random_maze_matrix(size, ambient_size=None):
     # Remove dead ends
     _remove_dead_ends(maze)
     
-    # If maze has no open points, recurse to generate a new one
-    if np.sum(1 - maze) == 0:
+    # If maze has no open points or is disconnected, recurse to generate a new
+    # one
+    if not _is_connected(maze):
         return generate_random_maze_matrix(size, ambient_size=ambient_size)
 
     # Add wall border if necessary
-    if ambient_size is not None and ambient_size > size:
-        maze_with_border = np.ones((ambient_size, ambient_size))
-        start_index = (ambient_size - size) // 2
-        maze_with_border[start_index: start_index + size,
-                         start_index: start_index + size] = maze
-        maze = maze_with_border
+    if ambient_size is None or ambient_size < size:
+        ambient_size = size
+    maze_with_border = np.ones((ambient_size, ambient_size))
+    start_index = (ambient_size - size) // 2
+    maze_with_border[start_index: start_index + size,
+                     start_index: start_index + size] = maze
 
-    return maze
+    return maze_with_border
 
 
-def _generate_open_blob(maze, num_points):
+def _generate_open_blob(maze, num_points, neighbor_dict):
     """Try to generate an open connected blob of points in the maze.
     
     Args:
         maze: Instance of .maze.Maze.
         num_points: Int. Number of connected points to have in the blob.
+        neighbor_dict: Dictionary. Output of maze.get_neighbor_dict().
 
     Returns:
         blob_matrix: False or binary matrix of same size as maze. Ones
             correspond to points in the connected open blob. If False, then
             could not generate a valid blob.
     """
-    neighbor_dict = maze.get_neighbor_dict()
-
     # Seed the blob with a starting point
     blob = [maze.sample_open_point()]
+    blob_set = set(blob)  # For constant-time membership checks
     
     def _get_candidate_new_blob_point():
         # New potential new blob point from neighbors of existing blob point
         candidate_root = blob[np.random.randint(len(blob))]  #pylint: disable=invalid-sequence-index
         neighbors = neighbor_dict[candidate_root]
+        if not neighbors:
+            return None
         candidate = neighbors[np.random.randint(len(neighbors))]
         return candidate
+
+    def _can_grow():
+        # Whether any point in the blob has an open neighbor outside the blob
+        return any(
+            neighbor not in blob_set
+            for point in blob for neighbor in neighbor_dict[point]
+        )
     
     def _add_point():
         # Add a new point to the blob, returning True/False depending on whether
         # this was successful.
-        valid_candidate = False
         count = 0
-        while not valid_candidate:
+        while True:
             count += 1
-            candidate = _get_candidate_new_blob_point()
-            if not candidate or candidate in blob:
-                continue
-            else:
-                valid_candidate = True
-
             if count > _MAX_ITERS:
                 return False
+            if count % _BLOB_GROWTH_CHECK_PERIOD == 0 and not _can_grow():
+                # The blob fills its connected component of the maze, so
+                # rejection sampling would never find a new point
+                return False
+            candidate = _get_candidate_new_blob_point()
+            if candidate and candidate not in blob_set:
+                break
         blob.append(candidate)
+        blob_set.add(candidate)
         return True
 
     # Add num_points points to the blob if possible, else return False.
@@ -232,6 +300,14 @@ def get_connected_open_blob(maze, num_points):
         blob_matrix: Binary matrix of same size as maze. Ones correspond to
             points in the connected open blob.
     """
+    if num_points > np.count_nonzero(maze.maze == 0):
+        raise ValueError(
+            'Cannot generate an open connected blob of {} points in a maze '
+            'with fewer open points.'.format(num_points))
+
+    # The maze does not change between attempts, so compute its neighbors once
+    neighbor_dict = maze.get_neighbor_dict()
+
     valid_blob = False
     count = 0
     while not valid_blob:
@@ -239,7 +315,7 @@ def get_connected_open_blob(maze, num_points):
         if count > _MAX_ITERS:
             raise ValueError('Could not generate an open connected blob.')
         
-        blob_matrix = _generate_open_blob(maze, num_points)
+        blob_matrix = _generate_open_blob(maze, num_points, neighbor_dict)
         if not isinstance(blob_matrix, bool):
             valid_blob = True
     
@@ -20,4 +20,8 @@ import numpy as np
 
 def hsv_to_rgb(c):
   """Convert HSV tuple to RGB tuple."""
-  return tuple((255 * np.array(colorsys.hsv_to_rgb(*c))).astype(np.uint8))
+  rgb = colorsys.hsv_to_rgb(*c)
+  if all(0. <= x <= 1. for x in rgb):
+    # Scalar casts truncate like astype(np.uint8) for in-range values
+    return tuple(np.uint8(255 * x) for x in rgb)
+  return tuple((255 * np.array(rgb)).astype(np.uint8))
@@ -27,6 +27,11 @@ import numpy as np
 from PIL import Image
 from PIL import ImageDraw
 
+# Maximum number of (color, opacity) pairs whose RGBA fill is cached
+_MAX_CACHED_COLORS = 1024
+# Maximum number of polygon vertices that are scaled without allocating
+_VERTICES_BUFFER_SIZE = 256
+
 
 class PILRenderer(abstract_observer.AbstractObserver):
     """Render using Python Image Library (PIL/Pillow).
@@ -64,6 +69,10 @@ class PILRenderer(abstract_observer.AbstractObserver):
         self._anti_aliasing = anti_aliasing
         self._canvas_size = (anti_aliasing * image_size[0],
                              anti_aliasing * image_size[1])
+        # Scale from sprite vertices to canvas coordinates, and a buffer to
+        # hold scaled vertices that is reused across polygons
+        self._canvas_scale = np.array(self._canvas_size, dtype=float)
+        self._vertices_buffer = np.empty((_VERTICES_BUFFER_SIZE, 2))
         
         if polygon_modifier is None:
             polygon_modifier = polygon_modifiers.DoNothing()
@@ -73,14 +82,14 @@ class PILRenderer(abstract_observer.AbstractObserver):
             color_to_rgb = lambda x: x
         elif isinstance(color_to_rgb, str):
             color_to_rgb = getattr(color_maps, color_to_rgb)
-        self.color_to_rgb = color_to_rgb
+        self.color_to_rgb = color_to_rgb  # Also initializes self._rgba_cache
 
         self._observation_spec = specs.Array(
             shape=self._image_size + (3,), dtype=np.uint8)
 
         if bg_color is None:
             bg_color = (0, 0, 0)
-        self._canvas_bg = Image.new('RGB', self._canvas_size, bg_color)
+        self._bg_color = tuple(bg_color)
 
         self._canvas = Image.new('RGB', self._canvas_size)
         self._draw = ImageDraw.Draw(self._canvas, 'RGBA')
@@ -97,7 +106,9 @@ class PILRenderer(abstract_observer.AbstractObserver):
         Returns:
             Numpy uint8 RGB array of size self._image_size + (3,).
         """
-        self._canvas.paste(self._canvas_bg)
+        # Fill the canvas with the background color in place rather than
+        # pasting a separate background image
+        self._canvas.paste(self._bg_color, (0, 0) + self._canvas_size)
         
         polygon_modifier = self._polygon_modifier(state)
         
@@ -105,21 +116,62 @@ class PILRenderer(abstract_observer.AbstractObserver):
             for sprite in state[layer]:
                 polygons = polygon_modifier(layer, sprite)
                 for (vertices, color, opacity) in polygons:
-                    vertices = self._canvas_size * vertices
-                    color = self.color_to_rgb(color)
-                    color = tuple(list(color) + [opacity])
-                    self._draw.polygon([tuple(v) for v in vertices], fill=color)
+                    vertices = self._scale_vertices(vertices)
+                    color = self._get_rgba(color, opacity)
+                    # Pass a flat [x0, y0, x1, y1, ...] list, which PIL
+                    # accepts directly, to avoid building a tuple per vertex
+                    self._draw.polygon(vertices.ravel().tolist(), fill=color)
         image = self._canvas.resize(
             self._image_size, resample=Image.LANCZOS)
 
         # PIL uses a coordinate system with the origin (0, 0) at the upper-left,
         # but our environment uses an origin at the bottom-left (i.e.
         # mathematical convention). Hence we need to flip the render vertically
-        # to correct for that.
+        # to correct for that. Converting the PIL image to an array is the one
+        # unavoidable copy; np.flipud() returns a view, so adds no second copy.
         image = np.flipud(np.array(image))
         
         return image
 
+    def _scale_vertices(self, vertices):
+        """Scale vertices to canvas coordinates, reusing a buffer if possible.
+        
+        The returned array is only valid until the next call.
+        """
+        num_vertices = len(vertices)
+        if num_vertices > _VERTICES_BUFFER_SIZE:
+            return self._canvas_scale * vertices
+        out = self._vertices_buffer[:num_vertices]
+        np.multiply(vertices, self._canvas_scale, out=out)
+        return out
+
+    def _get_rgba(self, color, opacity):
+        """Get RGBA fill tuple for a sprite color and opacity, with caching.
+
+        Colors or opacities that are not hashable (e.g. numpy arrays) are
+        converted without caching.
+        """
+        key = (color, opacity)
+        try:
+            rgba = self._rgba_cache.get(key)
+        except TypeError:
+            return tuple(list(self._color_to_rgb(color)) + [opacity])
+        if rgba is None:
+            if len(self._rgba_cache) >= _MAX_CACHED_COLORS:
+                self._rgba_cache.clear()
+            rgba = tuple(list(self._color_to_rgb(color)) + [opacity])
+            self._rgba_cache[key] = rgba
+        return rgba
+
+    @property
+    def color_to_rgb(self):
+        return self._color_to_rgb
+
+    @color_to_rgb.setter
+    def color_to_rgb(self, color_to_rgb):
+        self._color_to_rgb = color_to_rgb
+        self._rgba_cache = {}
+
     @property
     def polygon_modifier(self):
         return self._polygon_modifier
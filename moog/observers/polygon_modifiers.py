@@ -73,6 +73,15 @@ class TorusGeometry(AbstractPolygonModifier):
     arena and reappear on the opposite edge.
     """
 
+    # Offsets of the 3x3 grid of copies, shaped to broadcast against a sprite's
+    # vertex array
+    _OFFSETS = np.array(
+        [[i, j] for i in [-1., 0., 1.] for j in [-1., 0., 1.]])[:, np.newaxis]
+    # Copies farther than this from the arena are not drawn. PIL can fill a
+    # pixel for a polygon up to one pixel outside the canvas, so this must
+    # exceed one pixel, which it does for any canvas at least 10 pixels wide.
+    _MARGIN = 0.1
+
     def __init__(self, wrap_layers):
         """Constructor.
 
@@ -88,11 +97,18 @@ class TorusGeometry(AbstractPolygonModifier):
         """Get polygon modifier rendering sprites as if the arena is a torus."""
         del state
         def _sprite_to_polygons(layer, sprite):
+            vertices = sprite.vertices
+            # Keep only the copies whose bounding box comes near the arena
+            min_corner = vertices.min(axis=0) - self._MARGIN
+            max_corner = vertices.max(axis=0) + self._MARGIN
+            offsets = self._OFFSETS[np.all(
+                (min_corner + self._OFFSETS < 1.) &
+                (max_corner + self._OFFSETS > 0.), axis=(1, 2))]
+
+            all_vertices = vertices + offsets
+            color = sprite.color
+            opacity = sprite.opacity
             squared_polygons = [
-                (sprite.vertices + np.array([i, j]), sprite.color,
-                 sprite.opacity)
-                for i in [-1., 0., 1.]
-                for j in [-1., 0., 1.]
-            ]
+                (vertices, color, opacity) for vertices in all_vertices]
             return squared_polygons
         return _sprite_to_polygons
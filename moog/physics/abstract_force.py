@@ -4,7 +4,7 @@ This file contains AbstractForce and AbstraceNewtonianForce classes.
 """
 
 import abc
-import numpy as np
+import math
 
 
 class AbstractForce(abc.ABC):
@@ -12,6 +12,10 @@ class AbstractForce(abc.ABC):
     
     All physics forces must inherit from this class.
     """
+
+    # Whether step() is a no-op for two sprites with disjoint bounding boxes.
+    # If True, the physics skips such pairs of sprites without calling step().
+    contact_only = False
     
     @abc.abstractmethod
     def step(self, *sprites, updates_per_env_step):
@@ -63,12 +67,14 @@ class AbstractNewtonianForce(AbstractForce, metaclass=abc.ABCMeta):
     
     def step(self, *sprites, updates_per_env_step):
         forces = self._compute_forces(*sprites)
+        updates_per_env_step = float(updates_per_env_step)
         for sprite, force in zip(sprites, forces):
-            if not np.isfinite(sprite.mass):
+            mass = sprite.mass
+            if not math.isfinite(mass):
                 # Good to catch this because sometimes we might make a sprite
                 # have infinite mass to prevent it from moving, but we don't
                 # want that sprite's velocity and consequently position to
                 # become NaN.
                 continue
-            delta_vel = force / (sprite.mass * float(updates_per_env_step))
+            delta_vel = force / (mass * updates_per_env_step)
             sprite.velocity += delta_vel
@@ -34,8 +34,8 @@ not simulated correctly.
 # _directed_collision_vectors() function.
 
 from . import abstract_force
-from matplotlib import path as mpl_path
-from matplotlib import transforms as mpl_transforms
+import functools
+import math
 import numpy as np
 from moog import sprite as sprite_lib
 
@@ -46,46 +46,132 @@ from moog import sprite as sprite_lib
 _EPSILON = 1e-2
 
 
-def _relative_motion_trajectory(path, path_sprite, anchor_sprite, delta_t):
-    """Find trajectory of a path in the coordinate frame of an anchor sprite.
+def _norm(vector):
+    """Norm of a 1-D vector.
+
+    This is computed the same way as np.linalg.norm(vector), so is identical to
+    it, but without its argument handling overhead.
+    """
+    return np.sqrt(vector.dot(vector))
+
+
+def _rotation_around(x, y, cos_theta, sin_theta):
+    """Affine matrix of shape [3, 3] rotating by theta around point (x, y).
+
+    The entries are computed with the same floating point operations as
+    matplotlib's Affine2D().rotate_around(x, y, theta).
+    """
+    a = cos_theta
+    b = sin_theta
+    return np.array([
+        [a, -b, (a * -x - b * -y) + x],
+        [b, a, (b * -x + a * -y) + y],
+        [0., 0., 1.],
+    ])
+
+
+def _translation(x, y):
+    """Affine matrix of shape [3, 3] translating by (x, y)."""
+    return np.array([[1., 0., x], [0., 1., y], [0., 0., 1.]])
+
+
+def _motion(sprite, delta_t):
+    """Position, displacement and rotation of a sprite over delta_t.
+
+    Returns:
+        Tuple (x, y, delta_x, delta_y, cos_theta, sin_theta), where theta is
+            the angle the sprite rotates by in delta_t.
+    """
+    x, y = sprite.position.tolist()
+    delta_x, delta_y = (sprite.velocity * delta_t).tolist()
+    theta = sprite.angle_vel * delta_t
+    return x, y, delta_x, delta_y, math.cos(theta), math.sin(theta)
 
-    Here path is rigidly tethered to path_sprite, i.e. it may consist of
-    vertices of path_sprite. This function produces the trajectory of the path
-    points in the inertial frame of anchor_sprite, i.e. the moving coordinate
-    system in which anchor_sprite is static.
+
+def _relative_motion_transforms(sprite_0, sprite_1, delta_t):
+    """Find the relative motion transforms between two sprites.
+
+    Both directions of a collision need the motion of both sprites, so this
+    computes it once and builds the transform for each direction from it. The
+    transforms are composed in the same order as matplotlib would, so results
+    are identical to using matplotlib's Affine2D.
 
     Args:
-        path: Instance of mpl_path.Path. path.vertices has shape [N, 2].
-        path_sprite: Instance of ../sprite.Sprite.
-        anchor_sprite: Instance of ../sprite.Sprite.
-        delta_t: Scalar. Timestep over which to produce the trajectories.
+        sprite_0: Instance of ../sprite.Sprite.
+        sprite_1: Instance of ../sprite.Sprite.
+        delta_t: Scalar. Timestep over which to produce the transforms.
+
+    Returns:
+        transform_0: Numpy array of shape [3, 3]. Affine transform taking points
+            tethered to sprite_0 to their previous position in the inertial
+            frame of sprite_1.
+        transform_1: Numpy array of shape [3, 3]. Affine transform taking points
+            tethered to sprite_1 to their previous position in the inertial
+            frame of sprite_0.
+    """
+    x_0, y_0, delta_x_0, delta_y_0, cos_0, sin_0 = _motion(sprite_0, delta_t)
+    x_1, y_1, delta_x_1, delta_y_1, cos_1, sin_1 = _motion(sprite_1, delta_t)
+
+    transform_0 = np.dot(
+        _translation(delta_x_1, delta_y_1),
+        np.dot(
+            _rotation_around(x_1, y_1, cos_1, sin_1),
+            np.dot(
+                _translation(-delta_x_0, -delta_y_0),
+                _rotation_around(x_0, y_0, cos_0, -sin_0),
+            ),
+        ),
+    )
+    transform_1 = np.dot(
+        _translation(delta_x_0, delta_y_0),
+        np.dot(
+            _rotation_around(x_0, y_0, cos_0, sin_0),
+            np.dot(
+                _translation(-delta_x_1, -delta_y_1),
+                _rotation_around(x_1, y_1, cos_1, -sin_1),
+            ),
+        ),
+    )
+
+    return transform_0, transform_1
+
+
+def _relative_motion_trajectory(vertices, transform):
+    """Find trajectory of vertices in the coordinate frame of an anchor sprite.
+
+    Here vertices are rigidly tethered to a path sprite, i.e. they may be
+    vertices of the path sprite. This function produces the trajectory of the
+    vertices in the inertial frame of an anchor sprite, i.e. the moving
+    coordinate system in which the anchor sprite is static.
+
+    Args:
+        vertices: Numpy array of shape [N, 2].
+        transform: Numpy array of shape [3, 3]. Relative motion transform from
+            the path sprite to the anchor sprite, as produced by
+            _relative_motion_transforms().
 
     Returns:
         trajectory: Numpy array of shape [N, 2, 2]. Element i of trajectory
             is an array of shape [2, 2] in which the second element is the i'th
-            path vertex and the first element is the previous position of that
-            vertex in the relative coordinate transformation between
-            anchor_sprite and path_sprite.
+            vertex and the first element is the previous position of that
+            vertex in the relative coordinate transformation between the
+            anchor sprite and the path sprite.
     """
-    transform = (
-        mpl_transforms.Affine2D().rotate_around(
-            *path_sprite.position,
-            theta=-1 * path_sprite.angle_vel * delta_t) +
-        mpl_transforms.Affine2D().translate(
-            *(-1 * path_sprite.velocity * delta_t)) +
-        mpl_transforms.Affine2D().rotate_around(
-            *anchor_sprite.position,
-            theta=anchor_sprite.angle_vel * delta_t) +
-        mpl_transforms.Affine2D().translate(
-            *anchor_sprite.velocity * delta_t)
-    )
-    previous_path = transform.transform_path(path)
-    trajectory = np.stack((previous_path.vertices, path.vertices), axis=1)
+    # Write the previous and current vertices directly into the trajectory
+    # array, which avoids the intermediate arrays of stacking them
+    x = vertices[:, 0]
+    y = vertices[:, 1]
+    trajectory = np.empty((len(vertices), 2, 2))
+    trajectory[:, 0, 0] = (
+        x * transform[0, 0] + y * transform[0, 1] + transform[0, 2])
+    trajectory[:, 0, 1] = (
+        x * transform[1, 0] + y * transform[1, 1] + transform[1, 2])
+    trajectory[:, 1] = vertices
 
     return trajectory
 
 
-def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
+def _directed_collision_vectors(sprite_0, sprite_1, transform):
     """Find single contact point and collision vectors.
     
     This function does the following:
@@ -103,7 +189,9 @@ def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
     Args:
         sprite_0: Instance of ../sprite.Sprite.
         sprite_1: Instance of ../sprite.Sprite.
-        delta_t: Scalar. Timestep of the physics.
+        transform: Numpy array of shape [3, 3]. Relative motion transform from
+            sprite_0 to sprite_1 over a timestep of the physics, as produced by
+            _relative_motion_transforms().
 
     Returns:
         collision_point: None or numpy array of shape [2]. Position of the
@@ -123,18 +211,13 @@ def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
     """
     # First find points of sprite_0 inside sprite_1
     vertices_0 = sprite_0.vertices
-    contained_inds = np.argwhere(sprite_1.contains_points(vertices_0))[:, 0]
-    if len(contained_inds) == 0:
+    contained = sprite_1.contains_points(vertices_0)
+    if not contained.any():
         return None, None, None, None
-    contained_vertices_0 = vertices_0[contained_inds]
+    contained_vertices_0 = vertices_0[contained]
 
     # Now find previous-to-current timestep trajectory of each contained vertex
-    traj = _relative_motion_trajectory(
-        mpl_path.Path(contained_vertices_0),
-        sprite_0,
-        sprite_1,
-        delta_t,
-    )
+    traj = _relative_motion_trajectory(contained_vertices_0, transform)
 
     # We will now find the crossing points between the previous-to-current
     # timestep relative trajectories of the vertices of sprite 0 and the edges 
@@ -147,7 +230,7 @@ def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
     # instabilities. We can easily compute these historical crossings from the
     # segment crossing coefficients.
     vertices_1 = sprite_1.vertices
-    vertices_1_next = np.concatenate((vertices_1[1:], vertices_1[:1]), axis=0)
+    vertices_1_next = sprite_1.vertices_next
     cross_a, cross_b = sprite_lib.segment_crossing_coefficients(
         start_0=traj[:, 0],
         end_0=traj[:, 1],
@@ -159,9 +242,9 @@ def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
     # cross_a < 1, but by allowing cross_a to be negative we let in historical
     # crossings and by allowing cross_a to be greater than 1 we let in future
     # crossings.
-    crossings = (cross_b >= 0) * (cross_b <= 1)
+    crossings = (cross_b >= 0) & (cross_b <= 1)
 
-    if not np.any(crossings):
+    if not crossings.any():
         # This can happen because of _EPSILON_INTERPOLATION in sprite.py
         return None, None, None, None
     
@@ -169,29 +252,28 @@ def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
     # set the non-crossing entries to -Inf. This is less cumbersome to implement
     # than setting to NaN and use np.nanargmin, because some slices in np.argmax
     # below might be all -Inf.
-    cross_a[np.logical_not(crossings)] = -np.inf
+    cross_a[~crossings] = -np.inf
     abs_cross_a = np.abs(1. - cross_a)
 
     # Get the crossing closest to the current vertex position for each vertex in
     # sprite_0. This will either be the most recent crossing or the most
     # imminent crossing.
     inds_crossings = np.argmin(abs_cross_a, axis=1)
-    crossing_points = np.array([
-        traj[i_0, 0] + cross_a[i_0, i_1] * (traj[i_0, 1] - traj[i_0, 0])
-        for (i_0, i_1) in enumerate(inds_crossings)
-    ])
+    traj_start = traj[:, 0]
+    traj_end = traj[:, 1]
+    cross_a_min = cross_a[np.arange(len(inds_crossings)), inds_crossings]
+    crossing_points = (
+        traj_start + cross_a_min[:, np.newaxis] * (traj_end - traj_start))
 
     # Get segment from crossing point to trajectory end
-    diffs_from_crossings = np.array([
-        traj[i, 1] - crossing_points[i]
-        for i in range(len(crossing_points))
-    ])
+    diffs_from_crossings = traj_end - crossing_points
 
     # Now we try to deduce which of the crossing points is the true collision
     # point. We do this by selecting the one for which the trajectory segment
     # endpoint is furthest from the crossing point, i.e. the point that is
     # deepest inside sprite_1.
-    dists_vertices_crossings = np.linalg.norm(diffs_from_crossings, axis=1)
+    dists_vertices_crossings = np.sqrt(
+        np.sum(diffs_from_crossings * diffs_from_crossings, axis=1))
     dists_vertices_crossings[dists_vertices_crossings == np.inf] = 0
     crossing_points_ind = np.argmax(dists_vertices_crossings)
     sprite_1_ind = inds_crossings[crossing_points_ind]
@@ -203,16 +285,15 @@ def _directed_collision_vectors(sprite_0, sprite_1, delta_t):
         # True collision point is in the future
         return collision_point, np.nan, since_collision, None
 
-    # Finally, compute the collision vector normal to sprite_1
-    delta_vertex_1 = (vertices_1_next[sprite_1_ind] -
-                      vertices_1[sprite_1_ind])
-    normal_vector = np.array([delta_vertex_1[1], -1 * delta_vertex_1[0]])
-    collision_normal = normal_vector / np.linalg.norm(normal_vector)
+    # Finally, get the collision vector normal to sprite_1. Sprites cache their
+    # edge normals, which are reused while the sprite does not move.
+    delta_vertex_1 = sprite_1.edges[sprite_1_ind]
+    collision_normal = sprite_1.edge_normals[sprite_1_ind]
 
     # Compute the perpendicular margin of overlap
     projection = delta_vertex_1 * (
         np.dot(since_collision, delta_vertex_1) /
-        np.dot(delta_vertex_1, delta_vertex_1)
+        sprite_1.edge_sq_lengths[sprite_1_ind]
     )
     perpendicular = since_collision - projection
 
@@ -251,13 +332,17 @@ def _get_collision_vectors(sprite_0, sprite_1, delta_t):
             how much sprite_0 has moved relative to sprite_1 since the collision
             event.
     """
+    # The relative motion of the sprites is shared by both directions
+    transform_0, transform_1 = _relative_motion_transforms(
+        sprite_0, sprite_1, delta_t)
+
     # First find the collision point on sprite_0 boundary
     collision_point_0, collision_normal_0, since_collision_0, perp_0 = (
-        _directed_collision_vectors(sprite_1, sprite_0, delta_t))
+        _directed_collision_vectors(sprite_1, sprite_0, transform_1))
     
     # Now find the collision point on sprite_1 boundary
     collision_point_1, collision_normal_1, since_collision_1, perp_1 = (
-        _directed_collision_vectors(sprite_0, sprite_1, delta_t))
+        _directed_collision_vectors(sprite_0, sprite_1, transform_0))
 
     # Make since_collision_i zero if no collision happened in the i direction
     if collision_point_0 is None:
@@ -270,7 +355,7 @@ def _get_collision_vectors(sprite_0, sprite_1, delta_t):
         since_collision_1 = np.zeros(2)
 
     # Pick which collision point to treat as the real collision point
-    if np.linalg.norm(since_collision_0) > np.linalg.norm(since_collision_1):
+    if _norm(since_collision_0) > _norm(since_collision_1):
         return collision_point_0, collision_normal_0, since_collision_0, perp_0
     else:
         return collision_point_1, collision_normal_1, since_collision_1, perp_1
@@ -306,8 +391,9 @@ def _collide_without_update_angle_vel(sprite_0,
             infinite mass.
     """
     # Sanity check that collision_normal has norm 1
-    collision_normal_norm = np.linalg.norm(collision_normal)
-    if not np.isclose(collision_normal_norm, 1., atol=1e-4):
+    # This is np.isclose(collision_normal_norm, 1., atol=1e-4), written out
+    collision_normal_norm = _norm(collision_normal)
+    if not abs(collision_normal_norm - 1.) <= 1e-4 + 1e-5:
         raise ValueError(
             'collision_normal_norm is {}, which is not close to 1.'.format(
                 collision_normal_norm))
@@ -318,8 +404,8 @@ def _collide_without_update_angle_vel(sprite_0,
     m_1 = sprite_1.mass
 
     # Only consider the component of velocity parallel to normal
-    vel_0_normal = np.dot(vel_0, collision_normal) * collision_normal
-    vel_1_normal = np.dot(vel_1, collision_normal) * collision_normal
+    vel_0_normal = vel_0.dot(collision_normal) * collision_normal
+    vel_1_normal = vel_1.dot(collision_normal) * collision_normal
 
     # Find inertial reference frame, i.e. velocity of center of mass of the
     # entire system
@@ -332,9 +418,9 @@ def _collide_without_update_angle_vel(sprite_0,
     delta_v_0 = (1 + elasticity) * (vel_cm_normal - vel_0_normal)
     delta_v_1 = (1 + elasticity) * (vel_cm_normal - vel_1_normal)
 
-    # Update the sprite velocities
-    sprite_0.velocity += delta_v_0
-    sprite_1.velocity += delta_v_1
+    # Update the sprite velocities in place
+    vel_0 += delta_v_0
+    vel_1 += delta_v_1
 
 
 def _collide_with_update_angle_vel(sprite_0,
@@ -408,16 +494,19 @@ def _collide_with_update_angle_vel(sprite_0,
     i_1 = sprite_1.moment_of_inertia
 
     # Extract only magnitude of velocity component parallel to normal
-    v_0 = np.dot(sprite_0.velocity, collision_normal)
-    v_1 = np.dot(sprite_1.velocity, collision_normal)
+    v_0 = sprite_0.velocity.dot(collision_normal)
+    v_1 = sprite_1.velocity.dot(collision_normal)
 
-    # Extract sin(theta), where theta is angle between normal and contact point
+    # Extract sin(theta), where theta is angle between normal and contact point.
+    # The cross products are written out on numpy scalars, which is much faster
+    # than np.cross() for single vectors.
+    normal_x, normal_y = collision_normal
     c_point_0 = collision_point - sprite_0.position
     c_point_1 = collision_point - sprite_1.position
-    r_0 = np.linalg.norm(c_point_0)
-    r_1 = np.linalg.norm(c_point_1)
-    sin_theta_0 = np.cross(c_point_0, collision_normal) / r_0
-    sin_theta_1 = np.cross(c_point_1, collision_normal) / r_1
+    r_0 = _norm(c_point_0)
+    r_1 = _norm(c_point_1)
+    sin_theta_0 = (c_point_0[0] * normal_y - c_point_0[1] * normal_x) / r_0
+    sin_theta_1 = (c_point_1[0] * normal_y - c_point_1[1] * normal_x) / r_1
 
     # Apply the collision equations. See docstring for a derivation sketch.
     s_0 = r_0 * sin_theta_0
@@ -434,13 +523,31 @@ def _collide_with_update_angle_vel(sprite_0,
     delta_w_0 = m_0 * delta_v_0 * s_0 / i_0
     delta_w_1 = m_1 * delta_v_1 * s_1 / i_1
 
-    # Update sprite velocities and angular velocities
-    sprite_0.velocity += delta_v_0 * collision_normal
-    sprite_1.velocity += delta_v_1 * collision_normal
+    # Update sprite velocities and angular velocities. The velocities are
+    # updated in place element-wise, which is faster than adding a scaled copy
+    # of collision_normal.
+    vel_0 = sprite_0.velocity
+    vel_1 = sprite_1.velocity
+    vel_0[0] += delta_v_0 * normal_x
+    vel_0[1] += delta_v_0 * normal_y
+    vel_1[0] += delta_v_1 * normal_x
+    vel_1[1] += delta_v_1 * normal_y
     sprite_0.angle_vel += delta_w_0
     sprite_1.angle_vel += delta_w_1
 
 
+def _displace_symmetric(sprite_0, sprite_1, perpendicular):
+    """Displace both sprites by half of the perpendicular margin of overlap."""
+    sprite_0.position = sprite_0.position - (0.5 + _EPSILON) * perpendicular
+    sprite_1.position = sprite_1.position + (0.5 + _EPSILON) * perpendicular
+
+
+def _displace_asymmetric(sprite_0, sprite_1, perpendicular):
+    """Displace sprite_0 by the perpendicular margin of overlap."""
+    del sprite_1
+    sprite_0.position = sprite_0.position - (1. + _EPSILON) * perpendicular
+
+
 class Collision(abstract_force.AbstractForce):
     """Collision simulator.
     
@@ -450,6 +557,8 @@ class Collision(abstract_force.AbstractForce):
     inertia (see ../sprite for details).
     """
 
+    contact_only = True
+
     def __init__(self, elasticity=1., symmetric=False, update_angle_vel=True,
                  max_recursion_depth=0):
         """Constructor.
@@ -478,6 +587,19 @@ class Collision(abstract_force.AbstractForce):
         self._update_angle_vel = update_angle_vel
         self._max_recursion_depth = max_recursion_depth
 
+        # Choose the displacement and collision functions once here instead of
+        # branching on every collision
+        if symmetric:
+            self._displace = _displace_symmetric
+        else:
+            self._displace = _displace_asymmetric
+        if update_angle_vel:
+            collide = _collide_with_update_angle_vel
+        else:
+            collide = _collide_without_update_angle_vel
+        self._collide = functools.partial(
+            collide, elasticity=elasticity, symmetric=symmetric)
+
     def step(self, sprite_0, sprite_1, updates_per_env_step, recursion_depth=0):
         """Step the physics.
         
@@ -490,85 +612,57 @@ class Collision(abstract_force.AbstractForce):
             updates_per_env_step: Int. Number of times this force step is called
                 for each step of the physics in the environment. This is used
                 here for inferring the exact contact point in the collision.
-            recursion_depth: Int. Number of times this function has recursed.
-                Used internally only to catch and avoid max recursion depth
-                errors.
+            recursion_depth: Int. Number of times the collision has already
+                been resolved, counting towards max_recursion_depth.
         """
-        if recursion_depth > self._max_recursion_depth:
-            return
-
         if sprite_0 == sprite_1:
             return
 
-        if not sprite_0.overlaps_sprite(sprite_1):
-            return
+        # Resolving a collision may create another one, so we step again until
+        # the sprites no longer collide or the maximum number of recursions is
+        # reached. This is a loop instead of a recursive call to avoid the
+        # function call overhead.
+        for _ in range(recursion_depth, self._max_recursion_depth + 1):
+            if not sprite_0.overlaps_sprite(sprite_1):
+                return
 
-        delta_t = 1. / updates_per_env_step
+            delta_t = 1. / updates_per_env_step
+
+            # First get collision point, normal, and relative sprite
+            # displacement since the collision
+            collision_point, collision_normal, _, perpendicular = (
+                _get_collision_vectors(sprite_0, sprite_1, delta_t))
+
+            if collision_point is None:
+                # Although the sprites do overlap, neither sprite contains any
+                # of the other's vertices. This can happen when the sprites
+                # collide exactly at two corners. This is annoying to handle
+                # because we must infer which corner hit which face in between
+                # timesteps, but must be done to ensure stability. See
+                # self._make_disjoint() for details.
+                self._make_disjoint(sprite_0, sprite_1)
+                continue
 
-        # First get collision point, normal, and relative sprite displacement
-        # since the collision
-        collision_point, collision_normal, _, perpendicular = (
-            _get_collision_vectors(sprite_0, sprite_1, delta_t))
-        
-        if collision_point is None:
-            # Although the sprites do overlap, neither sprite contains any of
-            # the other's vertices. This can happen when the sprites collide
-            # exactly at two corners. This is annoying to handle because we must
-            # infer which corner hit which face in between timesteps, but must
-            # be done to ensure stability. See self._make_disjoint() for
-            # details.
-            self._make_disjoint(sprite_0, sprite_1)
-        else:
             # Whether the collision point is in the future, in which case we
             # leave the sprites alone.
             future_collision_point = (
                 np.isscalar(collision_normal) and np.isnan(collision_normal))
-
-            if not future_collision_point:
-                # There was a collision in the past, so we must simulate it
-                # First, displace the sprites so they are no longer intersecting
-                # Note that instead of perpendicular displacement we could use
-                # since_collision. However, sometimes since_collision can have a
-                # very acute angle and large magnitude due to angular velocity
-                # or multiple collisions, so in prectice displacing by the
-                # perpendicular is more stable.
-                if self._symmetric:
-                    sprite_0.position = (
-                        sprite_0.position - (0.5 + _EPSILON) * perpendicular)
-                    sprite_1.position = (
-                        sprite_1.position + (0.5 + _EPSILON) * perpendicular)
-                else:
-                    sprite_0.position = (
-                        sprite_0.position - (1. + _EPSILON) * perpendicular)
-
-                # Second, change sprite velocities and angular velocities per
-                # Newtonian physics
-                if self._update_angle_vel:
-                    _collide_with_update_angle_vel(
-                        sprite_0,
-                        sprite_1,
-                        collision_point,
-                        collision_normal,
-                        elasticity=self._elasticity,
-                        symmetric=self._symmetric,
-                    )
-                else:
-                    _collide_without_update_angle_vel(
-                        sprite_0,
-                        sprite_1,
-                        collision_point,
-                        collision_normal,
-                        elasticity=self._elasticity,
-                        symmetric=self._symmetric,
-                    )
-            else:
+            if future_collision_point:
                 return
-            
-        # After perturbing the sprite positions and velocities, we recursively
-        # step again in case that perturbation has now created another
-        # collision.
-        self.step(sprite_0, sprite_1, updates_per_env_step,
-                  recursion_depth=recursion_depth + 1)
+
+            # There was a collision in the past, so we must simulate it
+            # First, displace the sprites so they are no longer intersecting
+            # Note that instead of perpendicular displacement we could use
+            # since_collision. However, sometimes since_collision can have a
+            # very acute angle and large magnitude due to angular velocity or
+            # multiple collisions, so in prectice displacing by the
+            # perpendicular is more stable.
+            self._displace(sprite_0, sprite_1, perpendicular)
+
+            # Second, change sprite velocities and angular velocities per
+            # Newtonian physics
+            self._collide(
+                sprite_0, sprite_1, collision_point, collision_normal)
 
     def _make_disjoint(self, sprite_0, sprite_1):
         """Perturb the positions of sprite_0 and sprite_1 to make them disjoint.
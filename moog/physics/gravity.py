@@ -19,7 +19,7 @@ class DownGravity(abstract_force.AbstractNewtonianForce):
         self._g = g
 
     def _compute_forces(self, sprite):
-        force = self._g * sprite.mass * np.array([0, 1])
+        force = np.array([0., self._g * sprite.mass])
         return (force,)
 
 
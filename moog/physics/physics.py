@@ -7,6 +7,12 @@ the Physics class in this file.
 from . import abstract_physics
 import itertools
 import numpy as np
+from moog import sprite as sprite_lib
+
+# Minimum number of sprite pairs for which contact-only forces are stepped with
+# a vectorized bounding box broad phase. For fewer pairs, the overhead of the
+# broad phase is larger than that of stepping the force on every pair.
+_MIN_BROAD_PHASE_PAIRS = 32
 
 
 class Physics(abstract_physics.AbstractPhysics):
@@ -85,6 +91,28 @@ class Physics(abstract_physics.AbstractPhysics):
         ]
         return args_iterables
 
+    def _step_contact_force(self, force, sprites_0, sprites_1,
+                            updates_per_env_step):
+        """Step a contact-only force on all pairs of sprites that may touch.
+
+        Pairs whose bounding boxes are disjoint are found for all pairs at once
+        and skipped. A pair is only skipped if neither sprite has been moved by
+        an earlier step in the loop, so the result is the same as stepping the
+        force on every pair.
+        """
+        overlaps = sprite_lib.bounding_boxes_overlap(sprites_0, sprites_1)
+        paths_0 = [sprite.path for sprite in sprites_0]
+        paths_1 = [sprite.path for sprite in sprites_1]
+        for i, sprite_0 in enumerate(sprites_0):
+            overlaps_i = overlaps[i].tolist()
+            for j, sprite_1 in enumerate(sprites_1):
+                if (not overlaps_i[j] and sprite_0.path is paths_0[i] and
+                        sprite_1.path is paths_1[j]):
+                    continue
+                force.step(
+                    sprite_0, sprite_1,
+                    updates_per_env_step=updates_per_env_step)
+
     def apply_physics(self, state, updates_per_env_step):
         """Move the sprites according to the physics."""
 
@@ -103,7 +131,14 @@ class Physics(abstract_physics.AbstractPhysics):
             args_combinations = itertools.product(*args_iterables)
 
             for args in args_combinations:
-                for sprites in itertools.product(*[state[s] for s in args]):
+                sprite_lists = [state[s] for s in args]
+                if (force.contact_only and
+                        len(sprite_lists[0]) * len(sprite_lists[1]) >=
+                        _MIN_BROAD_PHASE_PAIRS):
+                    self._step_contact_force(
+                        force, *sprite_lists, updates_per_env_step)
+                    continue
+                for sprites in itertools.product(*sprite_lists):
                     force.step(
                         *sprites, updates_per_env_step=updates_per_env_step)
 
@@ -112,6 +147,6 @@ class Physics(abstract_physics.AbstractPhysics):
 
         # Move sprites based on their velocity
         delta_t = 1. / updates_per_env_step
-        for layer in state:
-            for sprite in state[layer]:
+        for sprites in state.values():
+            for sprite in sprites:
                 sprite.update_pos_from_vel(delta_t=delta_t)
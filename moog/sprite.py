@@ -24,6 +24,7 @@ attributes of a sprite and computing crossing points of lines and sprite edges.
 """
 
 import collections
+import copy
 from matplotlib import path as mpl_path
 from matplotlib import transforms as mpl_transforms
 import numpy as np
@@ -34,6 +35,17 @@ GLOBAL_SPRITE_COUNT = 0
 # Tiny float for numerical stability in segment_crossings()
 _EPSILON_INTERPOLATION = 1e-8
 
+# Absolute slack for the bounding box rejection in Sprite.overlaps_sprite(),
+# covering the tolerance of matplotlib's path intersection test.
+_BOUNDING_BOX_SLACK = 1e-9
+
+# Types of sprite attributes that are immutable, so can be shared by a sprite and
+# its deep copy. Matplotlib paths are included because sprites treat their paths
+# as immutable values, always replacing them (e.g. with
+# transform.transform_path()) rather than modifying them in place.
+_IMMUTABLE_TYPES = (
+    bool, int, float, str, type(None), np.float64, mpl_path.Path)
+
 
 def update_sprite(sprite, **factors):
     """Update sprite in place given an entirely new set of factors.
@@ -92,6 +104,15 @@ def update_sprite(sprite, **factors):
     return
 
 
+def _cross_2d(a, b):
+    """Cross product of arrays of 2D vectors, broadcasting leading dimensions.
+
+    This computes the same as np.cross(a, b), without its axis handling
+    overhead, which dominates for the small arrays used here.
+    """
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
 def segment_crossing_coefficients(start_0, end_0, start_1, end_1):
     """Solves linear equations to compute crossing points of segments.
 
@@ -141,11 +162,11 @@ def segment_crossing_coefficients(start_0, end_0, start_1, end_1):
     ds_1 = ds_1[np.newaxis]
 
     # Need to add small epsilon for stability, else may divide by zero below
-    ds_0_cross_ds_1 = np.cross(ds_0, ds_1) + _EPSILON_INTERPOLATION
+    ds_0_cross_ds_1 = _cross_2d(ds_0, ds_1) + _EPSILON_INTERPOLATION
     s_1_minus_s_0 = s_1 - s_0
 
-    A = np.cross(s_1_minus_s_0, ds_1) / ds_0_cross_ds_1
-    B = np.cross(s_1_minus_s_0, ds_0) / ds_0_cross_ds_1
+    A = _cross_2d(s_1_minus_s_0, ds_1) / ds_0_cross_ds_1
+    B = _cross_2d(s_1_minus_s_0, ds_0) / ds_0_cross_ds_1
 
     return A, B
 
@@ -213,6 +234,32 @@ def sprite_edge_crossings(sprite_0, sprite_1):
     return crossing_points, inds_crossings
 
 
+def bounding_boxes_overlap(sprites_0, sprites_1):
+    """Check which pairs of sprites have overlapping bounding boxes.
+
+    This is a vectorized broad phase for Sprite.overlaps_sprite(), which returns
+    False for every pair whose entry here is False.
+
+    Args:
+        sprites_0: Sequence of M instances of Sprite.
+        sprites_1: Sequence of N instances of Sprite.
+
+    Returns:
+        overlaps: Boolean numpy array of shape [M, N].
+    """
+    if not sprites_0 or not sprites_1:
+        return np.zeros((len(sprites_0), len(sprites_1)), dtype=bool)
+    boxes_0 = np.array([s.bounding_box for s in sprites_0])
+    boxes_1 = np.array([s.bounding_box for s in sprites_1])
+    disjoint = (
+        (boxes_0[:, 2:3] + _BOUNDING_BOX_SLACK < boxes_1[:, 0]) |
+        (boxes_1[:, 2] + _BOUNDING_BOX_SLACK < boxes_0[:, 0:1]) |
+        (boxes_0[:, 3:4] + _BOUNDING_BOX_SLACK < boxes_1[:, 1]) |
+        (boxes_1[:, 3] + _BOUNDING_BOX_SLACK < boxes_0[:, 1:2])
+    )
+    return ~disjoint
+
+
 class Sprite(object):
     """Sprite class.
 
@@ -301,9 +348,21 @@ class Sprite(object):
         self._opacity = opacity
         self._velocity = np.array([x_vel, y_vel])
         self._angle_vel = angle_vel
-        self._mass = mass
+        self.mass = mass
         self.metadata = metadata
 
+        # Cache for self.bounding_box, valid while self._path is the path it
+        # was computed from
+        self._bounding_box = None
+        self._bounding_box_path = None
+
+        # Cache for self.edges, self.edge_normals and self.edge_sq_lengths,
+        # valid while self._path is the path they were computed from
+        self._edges = None
+        self._edge_normals = None
+        self._edge_sq_lengths = None
+        self._edges_path = None
+
         # This calls shape.setter, which does shape path setting
         self.shape = shape
 
@@ -410,9 +469,37 @@ class Sprite(object):
         # scale
         self._x_y_rotational_inertia *= np.square(x_y_scale)
 
+    def __deepcopy__(self, memo):
+        """Deepcopy the sprite.
+
+        Environment states are deepcopied often (e.g. every simulation step of
+        ../env_wrappers/simulation.SimulationEnvironment), so this copies the
+        sprite's arrays directly instead of through the generic copy.deepcopy()
+        dispatch, which is several times faster. The sprite's paths are shared
+        structurally with the copy, since they are never modified in place.
+        """
+        cls = self.__class__
+        new_sprite = cls.__new__(cls)
+        memo[id(self)] = new_sprite
+        sprite_dict = {}
+        for k, v in self.__dict__.items():
+            v_type = type(v)
+            if v_type in _IMMUTABLE_TYPES:
+                sprite_dict[k] = v
+            elif v_type is np.ndarray:
+                sprite_dict[k] = v.copy()
+            else:
+                sprite_dict[k] = copy.deepcopy(v, memo)
+        new_sprite.__dict__ = sprite_dict
+        return new_sprite
+
     def update_pos_from_vel(self, delta_t):
         """Update position based on velocity."""
-        self.position = self.position + delta_t * self.velocity
+        vel_x, vel_y = self._velocity
+        if vel_x or vel_y:
+            # Stationary sprites keep their position and path, which saves
+            # transforming the path and keeps its cached bounding box valid
+            self.position = self._position + delta_t * self._velocity
         if self._angle_vel:
             self.angle = self.angle + delta_t * self._angle_vel
 
@@ -448,6 +535,15 @@ class Sprite(object):
 
     def overlaps_sprite(self, sprite):
         """Check if this and the argument sprite overlap."""
+        # Cheaply reject sprites whose bounding boxes are disjoint
+        x_min_0, y_min_0, x_max_0, y_max_0 = self.bounding_box.tolist()
+        x_min_1, y_min_1, x_max_1, y_max_1 = sprite.bounding_box.tolist()
+        if (x_max_0 + _BOUNDING_BOX_SLACK < x_min_1 or
+                x_max_1 + _BOUNDING_BOX_SLACK < x_min_0 or
+                y_max_0 + _BOUNDING_BOX_SLACK < y_min_1 or
+                y_max_1 + _BOUNDING_BOX_SLACK < y_min_0):
+            return False
+
         center_dist = np.linalg.norm(self.position - sprite.position)
         if center_dist > self.max_radius + sprite.max_radius:
             return False
@@ -475,6 +571,15 @@ class Sprite(object):
         """Numpy array of vertices of the shape."""
         return self.path.vertices[:-1]
 
+    @property
+    def vertices_next(self):
+        """Vertices rolled by one, so vertices[i] to vertices_next[i] is an edge.
+
+        This is a view into the path, which already closes the loop, so no array
+        is allocated.
+        """
+        return self.path.vertices[1:]
+
     @property
     def path(self):
         """Numpy array of length len(self.vertices) + 1, loop of the shape."""
@@ -484,6 +589,53 @@ class Sprite(object):
     def max_radius(self):
         return self._max_radius
 
+    @property
+    def bounding_box(self):
+        """Axis-aligned bounding box, array [x_min, y_min, x_max, y_max]."""
+        # Paths are never modified in place, so the cached bounding box is valid
+        # as long as the path has not been replaced
+        if self._bounding_box_path is not self._path:
+            vertices = self._path.vertices
+            self._bounding_box = np.concatenate(
+                (vertices.min(axis=0), vertices.max(axis=0)))
+            self._bounding_box_path = self._path
+        return self._bounding_box
+
+    def _update_edges(self):
+        """Recompute the cached edge arrays if the path has been replaced."""
+        if self._edges_path is self._path:
+            return
+        edges = self.vertices_next - self.vertices
+        normals = np.stack((edges[:, 1], -1 * edges[:, 0]), axis=1)
+        # Batched matmul computes each dot product the same way as
+        # ndarray.dot(), so these match normalizing every edge on its own
+        normals_sq_lengths = np.matmul(
+            normals[:, np.newaxis], normals[:, :, np.newaxis])[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._edge_normals = normals / np.sqrt(normals_sq_lengths)
+        self._edge_sq_lengths = np.matmul(
+            edges[:, np.newaxis], edges[:, :, np.newaxis])[:, 0, 0]
+        self._edges = edges
+        self._edges_path = self._path
+
+    @property
+    def edges(self):
+        """Array of edge vectors, self.vertices_next - self.vertices."""
+        self._update_edges()
+        return self._edges
+
+    @property
+    def edge_normals(self):
+        """Array of unit edge normals, each edge rotated clockwise by 90 deg."""
+        self._update_edges()
+        return self._edge_normals
+
+    @property
+    def edge_sq_lengths(self):
+        """Array of squared edge lengths."""
+        self._update_edges()
+        return self._edge_sq_lengths
+
     @property
     def is_symmetric_circle(self):
         return self.shape == Sprite._CIRCLE_NAME and self.aspect_ratio == 1
@@ -591,6 +743,14 @@ class Sprite(object):
     @mass.setter
     def mass(self, mass):
         self._mass = mass
+        # Cache the inverse mass, since action spaces and forces multiply by it
+        # every step. Zero mass gives infinite inverse mass, consistent with
+        # dividing by zero.
+        self._inv_mass = 1. / mass if mass else np.inf
+
+    @property
+    def inv_mass(self):
+        return self._inv_mass
 
     @property
     def color(self):
@@ -615,8 +775,10 @@ class Sprite(object):
                 'Cannot call in-place operations on sprite.position.')
         if not isinstance(pos, np.ndarray):
             pos = np.array(pos)
-        translate = mpl_transforms.Affine2D().translate(*pos - self._position)
-        self._path = translate.transform_path(self._path)
+        # Translate the path vertices directly, which gives the same vertices
+        # as an Affine2D translation at a fraction of the cost
+        self._path = mpl_path.Path(
+            self._path.vertices + (pos - self._position), self._path.codes)
         self._position = pos
 
     @property
@@ -109,7 +109,14 @@ def _state_str_to_image(state_str, renderer, attributes, stored_sprites):
             create_new_sprite = False
             vertices = None
 
-            if len(sprite_str) == len(attributes) + 1:
+            if len(sprite_str) == 1:
+                # Sprite is unchanged since the previous timestep, so only its
+                # id was logged
+                sprite_id = sprite_str[0]
+                active_sprite_ids.append(sprite_id)
+                layer_sprites.append(stored_sprites[sprite_id])
+                continue
+            elif len(sprite_str) == len(attributes) + 1:
                 # Vertices are the last element of sprite_str
                 vertices = np.array(sprite_str.pop(-1))
                 create_new_sprite = True
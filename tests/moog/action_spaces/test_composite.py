@@ -0,0 +1,62 @@
+"""Tests for moog/action_spaces/composite.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_composite.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import collections
+import numpy as np
+import pytest
+
+from moog import action_spaces
+from moog import sprite
+
+
+def _get_state():
+    return collections.OrderedDict([
+        ('agent_0', [sprite.Sprite(x=0.5, y=0.5)]),
+        ('agent_1', [sprite.Sprite(x=0.5, y=0.5)]),
+    ])
+
+
+class TestComposite():
+
+    def setup_method(self):
+        self.action_space = action_spaces.Composite(
+            agent_0=action_spaces.SetPosition(action_layers='agent_0'),
+            agent_1=action_spaces.SetPosition(action_layers='agent_1'),
+        )
+
+    def testDictAndTupleActions(self):
+        """Dict actions and tuple actions ordered like action_keys agree."""
+        state = _get_state()
+        self.action_space.step(state, {'agent_1': [0.2, 0.3]})
+        assert np.allclose(state['agent_0'][0].position, [0.5, 0.5])
+        assert np.allclose(state['agent_1'][0].position, [0.2, 0.3])
+
+        self.action_space.step(state, ([0.1, 0.4], [0.7, 0.8]))
+        assert np.allclose(state['agent_0'][0].position, [0.1, 0.4])
+        assert np.allclose(state['agent_1'][0].position, [0.7, 0.8])
+
+    def testUnknownKey(self):
+        with pytest.raises(KeyError):
+            self.action_space.step(_get_state(), {'agent_2': [0.2, 0.3]})
+
+    def testWrongTupleLength(self):
+        with pytest.raises(ValueError):
+            self.action_space.step(_get_state(), ([0.2, 0.3],))
@@ -0,0 +1,179 @@
+"""Tests for moog/env_wrappers/logger.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_logger.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import collections
+import json
+import numpy as np
+import os
+
+from moog import action_spaces
+from moog import environment
+from moog import game_rules as game_rules_lib
+from moog import observers
+from moog import physics as physics_lib
+from moog import sprite
+from moog import tasks
+from moog.env_wrappers import logger
+from moog_demos import restore_logged_data
+
+
+class _Blink(game_rules_lib.AbstractRule):
+    """Game rule temporarily removing the blinker sprite from the state."""
+
+    def reset(self, state, meta_state):
+        del meta_state
+        self._steps = 0
+        self._blinker = state['blinker'][0]
+
+    def step(self, state, meta_state):
+        del meta_state
+        self._steps += 1
+        if self._steps == 3:
+            state['blinker'].remove(self._blinker)
+        elif self._steps == 5:
+            state['blinker'].append(self._blinker)
+
+
+def get_env(log_dir, timeout_steps=4, game_rules=(), **logger_kwargs):
+    """Get simple environment wrapped in logger."""
+    # The wall is shared across episodes, so it keeps its id
+    wall = sprite.Sprite(x=0.1, y=0.1, scale=0.1, c1=128)
+
+    def _state_initializer():
+        agent = sprite.Sprite(x=0.5, y=0.5, scale=0.1, c0=128)
+        blinker = sprite.Sprite(x=0.8, y=0.2, scale=0.1, shape='triangle')
+        state = collections.OrderedDict(
+            [('wall', [wall]), ('blinker', [blinker]), ('agent', [agent])])
+        return state
+
+    env = environment.Environment(
+        state_initializer=_state_initializer,
+        physics=physics_lib.Physics(),
+        task=tasks.CompositeTask(timeout_steps=timeout_steps),
+        action_space=action_spaces.Grid(
+            0.1, action_layers='agent', control_velocity=True),
+        observers={'image': observers.PILRenderer(image_size=(16, 16))},
+        game_rules=game_rules,
+    )
+    return logger.LoggingEnvironment(
+        env, log_dir=str(log_dir), **logger_kwargs)
+
+
+def _run_episode(env, actions=(1, 2, 3, 4, 0, 1)):
+    """Run an episode, returning the number of steps taken."""
+    env.reset()
+    for num_steps, action in enumerate(actions, start=1):
+        if env.step(action).last():
+            return num_steps
+    raise ValueError('Episode did not end.')
+
+
+class TestLoggingEnvironment():
+    """Tests for logging environment wrapper."""
+
+    def testStreamedEpisodes(self, tmp_path):
+        """Each finished episode is a complete json list in a numerical file."""
+        env = get_env(tmp_path)
+        episode_lengths = [_run_episode(env) for _ in range(2)]
+        log_dir = env._log_dir
+
+        assert sorted(os.listdir(log_dir)) == [
+            '00000', '00001', 'attributes.txt', 'description.txt']
+        for filename, episode_length in zip(['00000', '00001'],
+                                            episode_lengths):
+            with open(os.path.join(log_dir, filename)) as f:
+                episode = json.load(f)
+            assert len(episode) == episode_length
+            for step in episode:
+                assert [x[0] for x in step[:-1]] == [
+                    'time', 'reward', 'step_type', 'action', 'meta_state']
+                assert [layer[0] for layer in step[-1]] == [
+                    'wall', 'blinker', 'agent']
+            assert episode[-1][2][1] == 2  # dm_env.StepType.LAST
+
+    def testUnfinishedEpisode(self, tmp_path):
+        """An unfinished episode is never written as an episode file."""
+        env = get_env(tmp_path)
+        _run_episode(env)
+        env.reset()
+        env.step(1)
+        log_dir = env._log_dir
+
+        assert sorted(os.listdir(log_dir)) == [
+            '00000', '00001' + logger._PARTIAL_SUFFIX,
+            'attributes.txt', 'description.txt']
+
+        env.close()
+        assert sorted(os.listdir(log_dir)) == [
+            '00000', 'attributes.txt', 'description.txt']
+        with open(os.path.join(log_dir, '00000')) as f:
+            json.load(f)
+
+    def testCompressedRoundTrip(self, tmp_path):
+        """Restoring a compressed log rebuilds the logged sprites."""
+        env = get_env(
+            tmp_path, timeout_steps=6, game_rules=(_Blink(),),
+            compress_unchanged_sprites=True)
+        actions = (1, 1, 0, 2, 0, 3, 4)
+
+        # Record the true sprite factors and vertices of every logged step
+        true_states = []
+        for _ in range(2):
+            env.reset()
+            for action in actions:
+                timestep = env.step(action)
+                true_states.append([
+                    (k, [(s.factors, s.vertices.copy()) for s in sprites])
+                    for k, sprites in env.state.items()
+                ])
+                if timestep.last():
+                    break
+
+        log_dir = env._log_dir
+        with open(os.path.join(log_dir, 'attributes.txt')) as f:
+            attributes = json.load(f)
+        logged_steps = []
+        for filename in ['00000', '00001']:
+            with open(os.path.join(log_dir, filename)) as f:
+                logged_steps.extend(json.load(f))
+        assert len(logged_steps) == len(true_states)
+
+        # The unchanged wall is compressed, except on the first step of each
+        # episode
+        wall_logs = [step[-1][0][1][0] for step in logged_steps]
+        assert [len(x) == 1 for x in wall_logs] == 2 * (
+            [False] + (len(logged_steps) // 2 - 1) * [True])
+
+        stored_sprites = {}
+        for step, true_state in zip(logged_steps, true_states):
+            restored_state = restore_logged_data._state_str_to_image(
+                step[-1], lambda state: state, attributes, stored_sprites)
+            assert list(restored_state.keys()) == [k for k, _ in true_state]
+            for (k, true_sprites) in true_state:
+                restored_sprites = restored_state[k]
+                assert len(restored_sprites) == len(true_sprites)
+                for s, (factors, vertices) in zip(
+                        restored_sprites, true_sprites):
+                    for name, value in factors.items():
+                        if name in ('shape', 'metadata'):
+                            continue
+                        assert np.allclose(getattr(s, name), value)
+                    assert np.allclose(s.vertices, vertices)
@@ -20,11 +20,15 @@ import sys
 sys.path.insert(0, '...')  # Allow imports from moog codebase
 
 import collections
+import io
 import numpy as np
+import pickle
+import pytest
 
 from moog import action_spaces
 from moog import environment
 from moog import game_rules
+from moog import maze_lib
 from moog import observers
 from moog import physics as physics_lib
 from moog import sprite
@@ -32,7 +36,7 @@ from moog import tasks
 from moog.env_wrappers import simulation
 
 
-def get_env():
+def get_env(wrapper=simulation.SimulationEnvironment):
     """Get simple environment, wrapper in simulation wrapper."""
     def _state_initializer():
         agent = sprite.Sprite(x=0.5, y=0.5, scale=0.1, c0=128)
@@ -60,16 +64,44 @@ def get_env():
         meta_state_initializer=lambda: {'key': 0},
         game_rules=(update_meta_state,),
     )
-    sim_env = simulation.SimulationEnvironment(env)
+    sim_env = wrapper(env)
+    return sim_env
+
+
+def get_maze_env(wrapper=simulation.SimulationEnvironment):
+    """Get environment with a DeterministicMazeWalk force, in a wrapper."""
+    maze = maze_lib.Maze(np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]]))
+
+    def _state_initializer():
+        walls = maze.to_sprites()
+        walker = sprite.Sprite(x=0.5, y=0.5, scale=0.1)
+        agent = sprite.Sprite(x=0.5, y=0.5, scale=0.1)
+        state = collections.OrderedDict(
+            [('walls', walls), ('walker', [walker]), ('agent', [agent])])
+        return state
+
+    # The only step velocity is consumed by the first step
+    maze_walk = physics_lib.DeterministicMazeWalk(
+        speed=0.01, step_velocities=[(1., 0.)])
+    env = environment.Environment(
+        state_initializer=_state_initializer,
+        physics=physics_lib.Physics((maze_walk, 'walker')),
+        task=tasks.Reset(lambda state: False),
+        action_space=action_spaces.Grid(0.1, action_layers='agent'),
+        observers={'image': observers.PILRenderer(image_size=(64, 64))},
+    )
+    sim_env = wrapper(env)
     return sim_env
 
 
 class TestSimulation():
     """Tests for simulation environment wrapper."""
 
+    wrapper = simulation.SimulationEnvironment
+
     def testStep(self):
         """Test for normal stepping without simulation."""
-        env = get_env()
+        env = get_env(self.wrapper)
         episode_actions = [1, 4, 3, 1, 2, 0]
 
         env.reset()
@@ -81,7 +113,7 @@ class TestSimulation():
 
     def testSimStepSimPop(self):
         """Test for simulation stepping and popping."""
-        env = get_env()
+        env = get_env(self.wrapper)
         sim_actions_init = [1, 4, 3]
         pop_inds_0 = [-1]
         sim_actions_reward_0 = [3, 1, 2, 0]
@@ -126,3 +158,81 @@ class TestSimulation():
         assert timestep.last()
 
         assert (env.meta_state['key'] == 7)
+
+    def testSimPopIndexError(self):
+        """Test that out-of-range sim_pop indices raise IndexError."""
+        env = get_env(self.wrapper)
+        env.reset()
+
+        with pytest.raises(IndexError):
+            env.sim_pop()
+
+        key = env.meta_state['key']
+        env.sim_step(1)
+        env.sim_step(4)
+        for index in [2, 5, -3]:
+            with pytest.raises(IndexError):
+                env.sim_pop(index)
+        assert len(env.stack) == 2
+
+        # Popping a valid index still works after the failed pops
+        env.sim_pop(-2)
+        assert len(env.stack) == 0
+        assert env.meta_state['key'] == key
+
+    def testSimPopRestoresForce(self):
+        """Test that sim_pop restores forces that change in step."""
+        env = get_maze_env(self.wrapper)
+        env.reset()
+        env.sim_step(4)
+        env.sim_step(4)
+        env.sim_pop(0)
+
+        expected_env = get_maze_env(self.wrapper)
+        expected_env.reset()
+        for _ in range(3):
+            env.step(4)
+            expected_env.step(4)
+            assert np.array_equal(
+                env.state['walker'][0].position,
+                expected_env.state['walker'][0].position)
+        assert np.any(env.state['walker'][0].velocity != 0.)
+
+
+class TestForkSimulation(TestSimulation):
+    """Tests for fork-based simulation environment wrapper."""
+
+    wrapper = simulation.ForkSimulationEnvironment
+
+
+class TestFunctionReferencePickling():
+    """Tests for pickling functions by reference in forked simulation."""
+
+    def _dump(self, obj):
+        f = io.BytesIO()
+        simulation._FunctionReferencePickler(f).dump(obj)
+        return f.getvalue()
+
+    def _load(self, pickled, functions):
+        return simulation._FunctionReferenceUnpickler(
+            io.BytesIO(pickled), functions, lambda: None).load()
+
+    def testRestoreFunction(self):
+        f = lambda x: x + 1
+        restored = self._load(self._dump({'f': f}), {id(f): f})
+        assert restored['f'] is f
+
+    def testUnknownFunction(self):
+        """Function without a counterpart in this process."""
+        f = lambda x: x + 1
+        with pytest.raises(pickle.UnpicklingError):
+            self._load(self._dump({'f': f}), {})
+
+    def testReusedFunctionId(self):
+        """Function id registered for an unrelated function."""
+        def f(x):
+            return x + 1
+        def g(x):
+            return x - 1
+        with pytest.raises(pickle.UnpicklingError):
+            self._load(self._dump({'f': f}), {id(f): g})
@@ -0,0 +1,65 @@
+"""Tests for moog/game_rules/task_phases.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_task_phases.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import collections
+
+from moog import game_rules
+
+
+class TestPhaseSequence():
+
+    def testPhasesRunInOrder(self):
+        """Phases should advance after their durations."""
+        phase_sequence = game_rules.PhaseSequence(
+            game_rules.Phase(duration=2, name='first'),
+            game_rules.Phase(duration=1, name='second'),
+            meta_state_phase_name_key='phase',
+        )
+        state = collections.OrderedDict()
+        meta_state = {}
+        phase_sequence.reset(state, meta_state)
+
+        phase_names = []
+        for _ in range(3):
+            phase_names.append(meta_state['phase'])
+            phase_sequence.step(state, meta_state)
+        assert phase_names == ['first', 'first', 'second']
+
+    def testStepAfterLastPhaseEnds(self):
+        """Stepping after the last phase ends should do nothing."""
+        def _count_step(meta_state):
+            meta_state['num_steps'] += 1
+        phase_sequence = game_rules.PhaseSequence(
+            game_rules.Phase(
+                continual_rules=game_rules.ModifyMetaState(_count_step),
+                duration=2,
+                name='only',
+            ),
+            meta_state_phase_name_key='phase',
+        )
+        state = collections.OrderedDict()
+        meta_state = {'num_steps': 0}
+        phase_sequence.reset(state, meta_state)
+
+        for _ in range(5):
+            phase_sequence.step(state, meta_state)
+        assert meta_state['num_steps'] == 2
+        assert meta_state['phase'] == 'only'
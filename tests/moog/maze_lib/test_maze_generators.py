@@ -0,0 +1,74 @@
+"""Tests for moog/maze_lib/maze_generators.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_maze_generators.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import numpy as np
+import pytest
+
+from moog.maze_lib import maze as maze_lib
+from moog.maze_lib import maze_generators
+
+
+class TestGenerateRandomMazeMatrix():
+
+    @pytest.mark.parametrize('size', [3, 8, 15])
+    def testMazeProperties(self, size):
+        """Mazes should be connected with no dead ends and no open blocks."""
+        np.random.seed(0)
+        for _ in range(5):
+            maze = maze_generators.generate_random_maze_matrix(size)
+            assert maze_generators._is_connected(maze)
+
+            is_open = np.pad(maze == 0, 1)
+            num_open_neighbors = (
+                is_open[:-2, 1:-1].astype(int) + is_open[2:, 1:-1] +
+                is_open[1:-1, :-2] + is_open[1:-1, 2:])
+            assert np.all(num_open_neighbors[maze == 0] >= 2)
+
+            open_blocks = (
+                is_open[:-1, :-1] & is_open[1:, :-1] & is_open[:-1, 1:] &
+                is_open[1:, 1:])
+            assert not np.any(open_blocks)
+
+    def testIsConnected(self):
+        """_is_connected() should detect empty and disconnected mazes."""
+        assert not maze_generators._is_connected(np.ones((3, 3)))
+        assert maze_generators._is_connected(np.array([[0, 0], [1, 0]]))
+        assert not maze_generators._is_connected(np.array([[0, 1], [1, 0]]))
+
+
+class TestGetConnectedOpenBlob():
+
+    def testSmallComponent(self):
+        """Blobs seeded in a too-small component should be retried."""
+        maze_matrix = np.ones((5, 5))
+        maze_matrix[1, :3] = 0  # Component with 3 points
+        maze_matrix[3, :] = 0  # Component with 5 points
+        maze = maze_lib.Maze(maze_matrix)
+        np.random.seed(0)
+        for _ in range(5):
+            blob_matrix = maze_generators.get_connected_open_blob(maze, 5)
+            assert np.array_equal(blob_matrix[3], np.ones(5))
+
+    def testTooManyPoints(self):
+        """Asking for more points than open points should raise."""
+        maze = maze_lib.Maze(np.eye(4))
+        with pytest.raises(ValueError):
+            maze_generators.get_connected_open_blob(maze, 13)
@@ -0,0 +1,52 @@
+"""Tests for moog/observers/pil_renderer.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_pil_renderer.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import collections
+import numpy as np
+
+from moog import observers
+from moog import sprite
+
+
+def _get_state(color):
+    s = sprite.Sprite(
+        x=0.5, y=0.5, shape='square', scale=0.5, c0=color[0], c1=color[1],
+        c2=color[2])
+    return collections.OrderedDict([('sprites', [s])])
+
+
+class TestPILRenderer():
+
+    def testColorToRgbChange(self):
+        """Changing color_to_rgb should not use stale cached colors."""
+        renderer = observers.PILRenderer(image_size=(8, 8))
+        state = _get_state((255, 0, 0))
+        assert tuple(renderer(state)[4, 4]) == (255, 0, 0)
+
+        renderer.color_to_rgb = lambda c: (c[2], c[1], c[0])
+        assert tuple(renderer(state)[4, 4]) == (0, 0, 255)
+
+    def testArrayColor(self):
+        """Unhashable colors should still render."""
+        renderer = observers.PILRenderer(image_size=(8, 8))
+        # Factor distributions can produce 0-dimensional numpy arrays
+        state = _get_state((np.array(0), np.array(255), np.array(0)))
+        assert tuple(renderer(state)[4, 4]) == (0, 255, 0)
@@ -0,0 +1,86 @@
+"""Tests for moog/observers/polygon_modifiers.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_polygon_modifiers.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import collections
+import numpy as np
+import pytest
+
+from moog import observers
+from moog import sprite
+from moog.observers import polygon_modifiers
+
+
+class _AllTorusCopies(polygon_modifiers.AbstractPolygonModifier):
+    """Reference torus geometry, drawing all 9 copies of every sprite."""
+
+    def __call__(self, state):
+        del state
+        def _sprite_to_polygons(layer, sprite):
+            return [
+                (sprite.vertices + offset, sprite.color, sprite.opacity)
+                for offset in polygon_modifiers.TorusGeometry._OFFSETS
+            ]
+        return _sprite_to_polygons
+
+
+def _near_edge_state(random_state, num_sprites=40):
+    """State of sprites straddling or just beyond the edges of the arena."""
+    sprites = []
+    for _ in range(num_sprites):
+        position = random_state.uniform(0., 1., size=2)
+        # Move one or both coordinates close to an edge
+        for axis in random_state.choice(2, random_state.randint(1, 3), False):
+            position[axis] = random_state.choice([0., 1.]) + (
+                random_state.uniform(-0.15, 0.15))
+        sprites.append(sprite.Sprite(
+            x=position[0], y=position[1],
+            shape=random_state.choice(['circle', 'square', 'triangle']),
+            scale=random_state.uniform(0.02, 0.2),
+            angle=random_state.uniform(0., 2 * np.pi),
+            c0=random_state.randint(256), c1=random_state.randint(256),
+            c2=random_state.randint(256), opacity=random_state.randint(128, 256),
+        ))
+    return collections.OrderedDict([('sprites', sprites)])
+
+
+class TestTorusGeometry():
+
+    @pytest.mark.parametrize('image_size', [10, 16, 37, 64, 128])
+    @pytest.mark.parametrize('anti_aliasing', [1, 2])
+    def testRenderEquivalence(self, image_size, anti_aliasing):
+        """Skipping far copies does not change the rendered image."""
+        renderer_kwargs = dict(
+            image_size=(image_size, image_size), anti_aliasing=anti_aliasing)
+        renderer = observers.PILRenderer(
+            polygon_modifier=polygon_modifiers.TorusGeometry('sprites'),
+            **renderer_kwargs)
+        reference_renderer = observers.PILRenderer(
+            polygon_modifier=_AllTorusCopies(), **renderer_kwargs)
+
+        random_state = np.random.RandomState(image_size)
+        for _ in range(5):
+            state = _near_edge_state(random_state)
+            assert np.array_equal(renderer(state), reference_renderer(state))
+
+    def testInteriorSpriteDrawnOnce(self):
+        s = sprite.Sprite(x=0.5, y=0.5, scale=0.1)
+        sprite_to_polygons = polygon_modifiers.TorusGeometry('sprites')(None)
+        assert len(sprite_to_polygons('sprites', s)) == 1
@@ -0,0 +1,80 @@
+"""Tests for moog/physics/physics.py.
+
+To run this test, navigate to this directory and run
+```bash
+$ pytest test_physics.py --capture=tee-sys
+```
+
+Note: The --capture=tee-sys routes print statements to stdout, which is useful
+for debugging.
+
+Alternatively, to run this test and any others, navigate to any parent directory
+and simply run
+```bash
+$ pytest --capture=tee-sys
+```
+This will run all test_* files in children directories.
+"""
+
+import sys
+sys.path.insert(0, '...')  # Allow imports from moog codebase
+
+import collections
+import copy
+import numpy as np
+import pytest
+
+from moog import sprite
+from moog.physics import collisions
+from moog.physics import physics as physics_lib
+
+
+def _random_sprites(num_sprites, random_state):
+    return [
+        sprite.Sprite(
+            x=random_state.uniform(0.3, 0.7),
+            y=random_state.uniform(0.3, 0.7),
+            shape=random_state.choice(['circle', 'square', 'triangle']),
+            scale=0.1,
+            angle=random_state.uniform(0., 2 * np.pi),
+            x_vel=random_state.uniform(-0.02, 0.02),
+            y_vel=random_state.uniform(-0.02, 0.02),
+            angle_vel=random_state.uniform(-0.1, 0.1),
+        )
+        for _ in range(num_sprites)
+    ]
+
+
+class TestPhysics():
+
+    @pytest.mark.parametrize('num_sprites', [3, 12])
+    @pytest.mark.parametrize('symmetric', [False, True])
+    def testCollisionBroadPhase(self, num_sprites, symmetric):
+        """Collisions with and without the broad phase give identical results.
+        """
+        random_state = np.random.RandomState(0)
+        sprites_0 = _random_sprites(num_sprites, random_state)
+        sprites_1 = _random_sprites(num_sprites, random_state)
+        state = collections.OrderedDict([
+            ('sprites_0', sprites_0), ('sprites_1', sprites_1)])
+        force = collisions.Collision(symmetric=symmetric)
+        physics = physics_lib.Physics(
+            (force, 'sprites_0', 'sprites_1'), updates_per_env_step=1)
+
+        copies_0 = copy.deepcopy(sprites_0)
+        copies_1 = copy.deepcopy(sprites_1)
+
+        for _ in range(10):
+            physics.step(state)
+
+            for s_0 in copies_0:
+                for s_1 in copies_1:
+                    force.step(s_0, s_1, updates_per_env_step=1)
+            for s in copies_0 + copies_1:
+                s.update_pos_from_vel(delta_t=1.)
+
+        for s, s_copy in zip(sprites_0 + sprites_1, copies_0 + copies_1):
+            assert np.array_equal(s.position, s_copy.position)
+            assert np.array_equal(s.velocity, s_copy.velocity)
+            assert s.angle == s_copy.angle
+            assert s.angle_vel == s_copy.angle_vel